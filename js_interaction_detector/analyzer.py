@@ -1,9 +1,16 @@
 """Main analyzer that orchestrates the analysis pipeline."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 
-from js_interaction_detector.listener_extractor import extract_listeners
+from playwright.async_api import Error as PlaywrightError
+
+from js_interaction_detector.listener_extractor import (
+    ListenerInfo,
+    extract_listeners,
+)
 from js_interaction_detector.models import (
     AnalysisError,
     AnalysisResult,
@@ -11,106 +18,213 @@ from js_interaction_detector.models import (
     Interaction,
     ValidationInfo,
 )
-from js_interaction_detector.page_loader import PageLoader, PageLoadError
+from js_interaction_detector.page_loader import (
+    BrowserPool,
+    PageLoadError,
+    get_default_pool,
+    open_page,
+    validate_wait_strategy,
+)
 from js_interaction_detector.rule_inferrer import infer_validation_rule
 
 logger = logging.getLogger(__name__)
 
 
-async def analyze_page(url: str) -> AnalysisResult:
-    """Analyze a page for JavaScript-driven input validations.
+def _build_interaction(listener_info: ListenerInfo) -> Interaction | AnalysisError:
+    """Turn one element's extracted listeners into an Interaction.
 
     Args:
-        url: The URL to analyze
+        listener_info: Listener data extracted from the page
 
     Returns:
-        AnalysisResult containing all detected interactions and any errors
+        The Interaction, or an AnalysisError if it could not be built
     """
+    try:
+        rule = infer_validation_rule(listener_info.code)
+
+        element = ElementInfo(
+            selector=listener_info.selector,
+            tag=listener_info.tag,
+            type=listener_info.input_type,
+            name=listener_info.name,
+            id=listener_info.id,
+            placeholder=listener_info.placeholder,
+            attributes=listener_info.attributes or {},
+        )
+
+        validation = ValidationInfo(
+            type=rule.type,
+            raw_code=listener_info.code,
+            rule_description=rule.description if rule.type != "unknown" else None,
+            confidence=rule.confidence,
+        )
+
+        interaction = Interaction(
+            element=element,
+            triggers=listener_info.events,
+            validation=validation,
+        )
+        logger.info("Processed %s: %s", listener_info.selector, rule.type)
+        return interaction
+
+    except Exception as e:
+        logger.warning("Error processing %s: %s", listener_info.selector, e)
+        return AnalysisError(
+            element=listener_info.selector,
+            error=str(e),
+            phase="extraction",
+        )
+
+
+async def analyze_page_stream(
+    url: str, pool: BrowserPool | None = None, wait_strategy: str = "fast"
+) -> AsyncIterator[Interaction | AnalysisError]:
+    """Analyze a page, yielding each interaction or error as soon as it is built.
+
+    Callers that write results out incrementally (e.g. NDJSON) never need to
+    hold the whole result in memory.
+
+    Args:
+        url: The URL to analyze
+        pool: Browser pool to open the page in. Defaults to a shared pool for
+            the running event loop, so repeated calls reuse one browser.
+        wait_strategy: How to wait for the page to load, "fast" or "strict"
+            (see page_loader.WAIT_STRATEGIES)
+
+    Yields:
+        An Interaction for each element with listeners, or an AnalysisError
+        for each element (or page) that could not be analyzed
+
+    Raises:
+        ValueError: If wait_strategy is unknown
+    """
+    validate_wait_strategy(wait_strategy)
     logger.info(f"Starting analysis of {url}")
-    errors: list[AnalysisError] = []
-    interactions: list[Interaction] = []
-    analyzed_at = datetime.now(UTC).isoformat()
+    interaction_count = 0
+    error_count = 0
 
-    try:
-        async with PageLoader() as loader:
-            page = await loader.load(url)
+    if pool is None:
+        pool = get_default_pool()
 
-            # Extract event listeners
-            listeners = await extract_listeners(page)
+    try:
+        async with pool.context() as context:
+            page = await open_page(context, url, wait_strategy)
+
+            # One CDP session per page, detached before the context goes
+            # back to the pool
+            client = await page.context.new_cdp_session(page)
+            try:
+                listeners = await extract_listeners(page, client=client)
+            finally:
+                try:
+                    await client.detach()
+                except PlaywrightError:
+                    pass  # The page (and its session) may already be gone
             logger.info(f"Found {len(listeners)} elements with listeners")
 
-            # Process each listener
+            # Build an Interaction (or a per-element error) for each listener
             for listener_info in listeners:
-                try:
-                    # Infer validation rule
-                    rule = infer_validation_rule(listener_info.code)
-
-                    # Build element info
-                    element = ElementInfo(
-                        selector=listener_info.selector,
-                        tag=listener_info.tag,
-                        type=listener_info.input_type,
-                        name=listener_info.name,
-                        id=listener_info.id,
-                        placeholder=listener_info.placeholder,
-                        attributes=listener_info.attributes or {},
-                    )
-
-                    # Build validation info
-                    validation = ValidationInfo(
-                        type=rule.type,
-                        raw_code=listener_info.code,
-                        rule_description=rule.description
-                        if rule.type != "unknown"
-                        else None,
-                        confidence=rule.confidence,
-                    )
-
-                    # Create interaction
-                    interaction = Interaction(
-                        element=element,
-                        triggers=listener_info.events,
-                        validation=validation,
-                    )
-                    interactions.append(interaction)
-                    logger.info(f"Processed {listener_info.selector}: {rule.type}")
-
-                except Exception as e:
-                    logger.warning(f"Error processing {listener_info.selector}: {e}")
-                    errors.append(
-                        AnalysisError(
-                            element=listener_info.selector,
-                            error=str(e),
-                            phase="extraction",
-                        )
-                    )
+                outcome = _build_interaction(listener_info)
+                if isinstance(outcome, Interaction):
+                    interaction_count += 1
+                else:
+                    error_count += 1
+                yield outcome
 
     except PageLoadError as e:
         logger.error(f"Page load error: {e}")
-        errors.append(
-            AnalysisError(
-                element=None,
-                error=str(e),
-                phase=e.phase,
-            )
+        error_count += 1
+        yield AnalysisError(
+            element=None,
+            error=str(e),
+            phase=e.phase,
         )
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        errors.append(
-            AnalysisError(
-                element=None,
-                error=str(e),
-                phase="discovery",
-            )
+        error_count += 1
+        yield AnalysisError(
+            element=None,
+            error=str(e),
+            phase="discovery",
         )
 
-    result = AnalysisResult(
+    logger.info(
+        f"Analysis complete: {interaction_count} interactions, {error_count} errors"
+    )
+
+
+async def analyze_page(
+    url: str, pool: BrowserPool | None = None, wait_strategy: str = "fast"
+) -> AnalysisResult:
+    """Analyze a page for JavaScript-driven input validations.
+
+    Collects analyze_page_stream into a single result.
+
+    Args:
+        url: The URL to analyze
+        pool: Browser pool to open the page in. Defaults to a shared pool for
+            the running event loop, so repeated calls reuse one browser.
+        wait_strategy: How to wait for the page to load, "fast" or "strict"
+
+    Returns:
+        AnalysisResult containing all detected interactions and any errors
+    """
+    analyzed_at = datetime.now(UTC).isoformat()
+    errors: list[AnalysisError] = []
+    interactions: list[Interaction] = []
+
+    # Bound once so the per-item loop skips the attribute lookups
+    add_interaction = interactions.append
+    add_error = errors.append
+    async for item in analyze_page_stream(url, pool=pool, wait_strategy=wait_strategy):
+        if isinstance(item, Interaction):
+            add_interaction(item)
+        else:
+            add_error(item)
+
+    return AnalysisResult(
         url=url,
         analyzed_at=analyzed_at,
         errors=errors,
         interactions=interactions,
     )
-    logger.info(
-        f"Analysis complete: {len(interactions)} interactions, {len(errors)} errors"
-    )
-    return result
+
+
+async def analyze_pages(
+    urls: list[str],
+    pool: BrowserPool,
+    concurrency: int = 8,
+    wait_strategy: str = "fast",
+) -> AsyncIterator[AnalysisResult]:
+    """Analyze many pages concurrently in one shared browser.
+
+    Each page gets its own BrowserContext; at most ``concurrency`` pages are
+    in flight at once. Results are yielded as each page finishes, so the
+    order may differ from ``urls``.
+
+    Args:
+        urls: The URLs to analyze
+        pool: Browser pool shared by all analyses
+        concurrency: Maximum number of pages analyzed at the same time
+        wait_strategy: How to wait for each page to load, "fast" or "strict"
+
+    Yields:
+        AnalysisResult for each URL, in completion order
+    """
+    logger.info(f"Analyzing {len(urls)} pages with concurrency={concurrency}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def analyze_one(url: str) -> AnalysisResult:
+        async with semaphore:
+            return await analyze_page(url, pool=pool, wait_strategy=wait_strategy)
+
+    # Real tasks rather than bare coroutines, so that analyses still in flight
+    # can be cancelled (and their contexts released) if the consumer stops early.
+    tasks = [asyncio.create_task(analyze_one(url)) for url in urls]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,25 +2,38 @@
 
 import argparse
 import asyncio
+import functools
 import logging
 import signal
 import sys
+from collections import Counter
 from pathlib import Path
 
 from playwright.async_api import async_playwright
 
-from js_interaction_detector.analyzer import analyze_page
+from js_interaction_detector.analyzer import (
+    analyze_page,
+    analyze_page_stream,
+    analyze_pages,
+)
 from js_interaction_detector.enumerator import (
     extract_interactive_elements,
-    generate_enumeration_tests,
+    write_enumeration_tests,
 )
 from js_interaction_detector.functional_tester.instrumentation import (
     generate_instrumentation_script,
 )
-from js_interaction_detector.functional_tester.usage_detector import detect_usage
+from js_interaction_detector.functional_tester.usage_detector import iter_usage
+from js_interaction_detector.models import to_ndjson_line
+from js_interaction_detector.page_loader import WAIT_STRATEGIES, BrowserPool
 from js_interaction_detector.recorder.session import RecordingSession
 from js_interaction_detector.recorder.test_generator import generate_test
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; use the stdlib loop
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,25 +46,42 @@ def setup_logging():
     )
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser with subcommands."""
-    parser = argparse.ArgumentParser(
-        prog="js-interaction-detector",
-        description="Detect JavaScript-driven interactions on web pages",
-    )
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    # analyze subcommand
+def _add_analyze_parser(subparsers) -> None:
+    """Register the analyze subcommand."""
     analyze_parser = subparsers.add_parser(
         "analyze",
         help="Analyze a page for input validations (default)",
     )
     analyze_parser.add_argument(
         "url",
-        help="URL to analyze (http, https, or file://)",
+        nargs="+",
+        help="URL(s) to analyze (http, https, or file://)",
+    )
+    analyze_parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=8,
+        help="Maximum pages analyzed at once when given several URLs (default: 8)",
+    )
+    analyze_parser.add_argument(
+        "--wait",
+        choices=WAIT_STRATEGIES,
+        default="fast",
+        help=(
+            "How to wait for pages to load: 'fast' (DOM ready, then a short "
+            "wait for the load event) or 'strict' (network idle) (default: fast)"
+        ),
+    )
+    analyze_parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON line per interaction or error as it is found",
     )
 
-    # record subcommand
+
+def _add_record_parser(subparsers) -> None:
+    """Register the record subcommand."""
     record_parser = subparsers.add_parser(
         "record",
         help="Record interactions and generate Playwright tests",
@@ -79,7 +109,9 @@ def create_parser() -> argparse.ArgumentParser:
         help="Run in headless mode (for testing)",
     )
 
-    # enumerate subcommand
+
+def _add_enumerate_parser(subparsers) -> None:
+    """Register the enumerate subcommand."""
     enumerate_parser = subparsers.add_parser(
         "enumerate",
         help="Enumerate interactive elements and generate presence tests",
@@ -95,7 +127,9 @@ def create_parser() -> argparse.ArgumentParser:
         help="Output path for generated test (default: ./a11y-tests.spec.ts)",
     )
 
-    # functional subcommand group
+
+def _add_functional_parser(subparsers) -> None:
+    """Register the functional subcommand group."""
     functional_parser = subparsers.add_parser(
         "functional",
         help="Analyze and test functional library APIs",
@@ -129,31 +163,122 @@ def create_parser() -> argparse.ArgumentParser:
         help="Output path for instrumentation script",
     )
 
+
+SUBCOMMAND_PARSERS = {
+    "analyze": _add_analyze_parser,
+    "record": _add_record_parser,
+    "enumerate": _add_enumerate_parser,
+    "functional": _add_functional_parser,
+}
+
+
+def create_parser(mode: str | None = None) -> argparse.ArgumentParser:
+    """Create the argument parser with subcommands.
+
+    Args:
+        mode: Subcommand being invoked. When it names a known subcommand only
+            that subparser is built; otherwise all of them are, so help and
+            error messages list every command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="js-interaction-detector",
+        description="Detect JavaScript-driven interactions on web pages",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    if mode in SUBCOMMAND_PARSERS:
+        SUBCOMMAND_PARSERS[mode](subparsers)
+    else:
+        for add_parser in SUBCOMMAND_PARSERS.values():
+            add_parser(subparsers)
+
     return parser
 
 
+@functools.cache
+def get_parser(mode: str | None = None) -> argparse.ArgumentParser:
+    """Get the shared argument parser for a mode, building it on first use.
+
+    Parsing does not mutate the parser, so one instance per mode serves
+    every call.
+    """
+    return create_parser(mode)
+
+
 def parse_args(args: list[str]) -> argparse.Namespace:
     """Parse command-line arguments with backwards compatibility."""
-    parser = create_parser()
-
     # Handle backwards compatibility: bare URL without subcommand
-    if (
-        args
-        and not args[0].startswith("-")
-        and args[0] not in ("analyze", "record", "enumerate", "functional")
-    ):
+    if args and not args[0].startswith("-") and args[0] not in SUBCOMMAND_PARSERS:
         # Assume it's a URL, prepend 'analyze'
         args = ["analyze"] + args
 
-    return parser.parse_args(args)
+    mode = args[0] if args else None
+    return get_parser(mode).parse_args(args)
 
 
-async def run_analyze(url: str) -> int:
-    """Run the analyze command."""
-    logger.info(f"Analyzing URL: {url}")
-    result = await analyze_page(url)
-    print(result.to_json())
-    return 0
+async def run_analyze(
+    urls: list[str],
+    concurrency: int = 8,
+    ndjson: bool = False,
+    wait_strategy: str = "fast",
+) -> int:
+    """Run the analyze command.
+
+    A single URL prints one indented JSON document. Several URLs are analyzed
+    concurrently in one browser and printed as NDJSON (one compact JSON
+    object per page) as each page finishes. With ``ndjson``, every
+    interaction and error is printed as its own line as soon as it is built.
+
+    Args:
+        urls: URLs to analyze
+        concurrency: Maximum number of pages analyzed at once
+        ndjson: Stream per-interaction NDJSON lines instead of whole results
+        wait_strategy: How to wait for pages to load, "fast" or "strict"
+
+    Returns:
+        Exit code (0 even when individual pages report errors)
+    """
+    if concurrency < 1:
+        print("Error: --concurrency must be at least 1", file=sys.stderr)
+        return 1
+
+    logger.info(f"Analyzing URLs: {urls}")
+    # The pool launches its browser lazily inside analyze_page, so a launch
+    # failure is reported in the JSON errors like any other analysis error.
+    pool = BrowserPool(max_contexts=concurrency)
+    try:
+        if ndjson:
+            await _stream_ndjson(urls, pool, concurrency, wait_strategy)
+            return 0
+
+        if len(urls) == 1:
+            result = await analyze_page(urls[0], pool=pool, wait_strategy=wait_strategy)
+            print(result.to_json())
+            return 0
+
+        async for result in analyze_pages(
+            urls, pool, concurrency=concurrency, wait_strategy=wait_strategy
+        ):
+            print(result.to_json(indent=None), flush=True)
+        return 0
+    finally:
+        await pool.shutdown()
+
+
+async def _stream_ndjson(
+    urls: list[str], pool: BrowserPool, concurrency: int, wait_strategy: str
+) -> None:
+    """Print each interaction or error of each page as an NDJSON line."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def stream_one(url: str) -> None:
+        async with semaphore:
+            async for item in analyze_page_stream(
+                url, pool=pool, wait_strategy=wait_strategy
+            ):
+                print(to_ndjson_line(url, item), flush=True)
+
+    await asyncio.gather(*(stream_one(url) for url in urls))
 
 
 async def run_record(
@@ -170,15 +295,59 @@ async def run_record(
     Returns:
         Exit code (0 for success, non-zero for errors)
     """
-    actions = []
-    session = None
-
     # Use an event to signal stop instead of a flag
     stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    # Install the handler BEFORE any async operations so Ctrl+C during page
+    # load doesn't cause a stack trace. The loop wakes on the signal itself,
+    # so nothing needs to poll for it.
+    previous_handler = None
+    if not headless:
+        try:
+            loop.add_signal_handler(signal.SIGINT, stop_event.set)
+        except NotImplementedError:
+            # Windows event loops have no add_signal_handler; hand the signal
+            # to the loop from a plain handler instead
+            previous_handler = signal.signal(
+                signal.SIGINT, lambda *_: loop.call_soon_threadsafe(stop_event.set)
+            )
+
+    try:
+        return await _record(url, output, timeout, headless, stop_event)
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+        elif not headless:
+            loop.remove_signal_handler(signal.SIGINT)
+
+
+async def _record(
+    url: str, output: str, timeout: int, headless: bool, stop_event: asyncio.Event
+) -> int:
+    """Record a session until stop_event is set, then write the test."""
+    actions = []
+    session = None
+    processing: asyncio.Task | None = None
+    # Set by on_action; tells a running pass that actions arrived meanwhile
+    actions_pending = False
+
+    async def process_quietly() -> None:
+        nonlocal actions_pending
+        # Keep going until a pass completes with no new action reported
+        while actions_pending:
+            actions_pending = False
+            try:
+                await session.process_pending_actions()
+            except Exception:
+                pass  # Ignore errors during incremental processing
 
-    def handle_sigint(signum, frame):
-        # Just set the event - don't raise, don't print
-        stop_event.set()
+    def on_action() -> None:
+        # Coalesce bursts (e.g. one event per keystroke) into one pass
+        nonlocal processing, actions_pending
+        actions_pending = True
+        if processing is None or processing.done():
+            processing = asyncio.create_task(process_quietly())
 
     print(
         "Recording... interact with the page, then press Ctrl+C to finish",
@@ -189,13 +358,10 @@ async def run_record(
         f"Starting recording session: url={url}, output={output}, timeout={timeout}, headless={headless}"
     )
 
-    # Install signal handler BEFORE any async operations so Ctrl+C during
-    # page load doesn't cause a stack trace
-    if not headless:
-        signal.signal(signal.SIGINT, handle_sigint)
-
     try:
-        session = RecordingSession(url, headed=not headless, settle_timeout=timeout)
+        session = RecordingSession(
+            url, headed=not headless, settle_timeout=timeout, on_action=on_action
+        )
 
         # Check if we got interrupted during setup
         if stop_event.is_set():
@@ -222,34 +388,17 @@ async def run_record(
             # For testing - just return immediately after page loads
             logger.info("Running in headless mode - returning immediately")
         else:
-            # Wait for stop event in headed mode
-            while not stop_event.is_set():
-                # Use wait with timeout instead of sleep to check the event
-                try:
-                    await asyncio.wait_for(stop_event.wait(), timeout=0.1)
-                except TimeoutError:
-                    # Timeout is expected - process pending actions
-                    try:
-                        await session.process_pending_actions()
-                    except Exception:
-                        pass  # Ignore errors during periodic processing
-
-        # Ignore further interrupts during cleanup
-        signal.signal(signal.SIGINT, signal.SIG_IGN)
+            # Actions are processed as the page reports them via on_action
+            await stop_event.wait()
 
     except (KeyboardInterrupt, asyncio.CancelledError):
         # Ctrl+C during async operations (e.g., during page load)
-        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ignore further interrupts
-        # Fall through to cleanup and test generation below
+        pass  # Fall through to cleanup and test generation below
 
     except Exception as e:
-        # Check if this is a browser-closed error from Ctrl+C during page load
-        error_str = str(e)
-        if "Target page, context or browser has been closed" in error_str:
-            # This is from Ctrl+C during page load - not a real error
-            signal.signal(signal.SIGINT, signal.SIG_IGN)
-            # Fall through to cleanup
-        else:
+        # A browser-closed error comes from Ctrl+C during page load - not a
+        # real error, so fall through to cleanup
+        if "Target page, context or browser has been closed" not in str(e):
             logger.error(f"Recording failed: {e}")
             print(f"Error: {e}", file=sys.stderr)
             return 1
@@ -259,10 +408,12 @@ async def run_record(
 
     # Try to process any final pending actions before browser closes
     if session:
+        if processing is not None:
+            await processing
         try:
             await session.process_pending_actions()
         except Exception:
-            # Browser likely already closing - actions from last ~100ms may be lost
+            # Browser likely already closing - the latest actions may be lost
             pass
 
         # Get recorded actions
@@ -322,23 +473,26 @@ async def run_functional_analyze(library: str, source: str, output: str) -> int:
 
     print(f"Analyzing {source} for {library} usage...", file=sys.stderr)
 
-    # Detect usage
-    call_sites = detect_usage(source_path, library)
+    # Detect usage, tallying call sites as they stream in
+    calls_per_function: Counter[str] = Counter()
+    static_count = 0
+    for call_site in iter_usage(source_path, library):
+        calls_per_function[call_site.function_name] += 1
+        static_count += call_site.has_static_args
+    total_calls = calls_per_function.total()
 
-    if not call_sites:
+    if not total_calls:
         print(f"No usage of {library} found in {source}", file=sys.stderr)
         return 0
 
     # Summarize findings
-    function_names = sorted({cs.function_name for cs in call_sites})
-    print(f"\nFound {len(call_sites)} call sites:", file=sys.stderr)
+    function_names = sorted(calls_per_function)
+    print(f"\nFound {total_calls} call sites:", file=sys.stderr)
     for fn in function_names:
-        count = sum(1 for cs in call_sites if cs.function_name == fn)
-        print(f"  - {fn}: {count} calls", file=sys.stderr)
+        print(f"  - {fn}: {calls_per_function[fn]} calls", file=sys.stderr)
 
     # Count static vs dynamic
-    static_count = sum(1 for cs in call_sites if cs.has_static_args)
-    dynamic_count = len(call_sites) - static_count
+    dynamic_count = total_calls - static_count
     print(f"\nStatic arguments: {static_count}", file=sys.stderr)
     print(f"Dynamic arguments: {dynamic_count}", file=sys.stderr)
 
@@ -395,16 +549,11 @@ async def run_enumerate(url: str, output: str) -> int:
         return 1
 
     # Count elements by role for summary
-    role_counts: dict[str, int] = {}
-    for el in elements:
-        role_counts[el.role] = role_counts.get(el.role, 0) + 1
-
-    # Generate tests
-    test_content, warnings = generate_enumeration_tests(url, elements)
+    role_counts = Counter(el.role for el in elements)
 
-    # Write output
+    # Generate tests, streaming them straight to the output file
     with open(output, "w") as f:
-        f.write(test_content)
+        warnings = write_enumeration_tests(url, elements, f)
 
     # Print summary
     print(f"Found {len(elements)} interactive elements:", file=sys.stderr)
@@ -444,11 +593,13 @@ async def run_cli(args: list[str]) -> int:
 
     if parsed.command is None:
         # No command and no args - show help
-        create_parser().print_help(sys.stderr)
+        get_parser().print_help(sys.stderr)
         return 1
 
     if parsed.command == "analyze":
-        return await run_analyze(parsed.url)
+        return await run_analyze(
+            parsed.url, parsed.concurrency, parsed.ndjson, parsed.wait
+        )
     elif parsed.command == "record":
         return await run_record(
             parsed.url, parsed.output, parsed.timeout, parsed.headless
@@ -469,7 +620,12 @@ async def run_cli(args: list[str]) -> int:
 
 def main():
     """Entry point for the CLI."""
-    exit_code = asyncio.run(run_cli(sys.argv[1:]))
+    if uvloop is not None:
+        exit_code = asyncio.run(
+            run_cli(sys.argv[1:]), loop_factory=uvloop.new_event_loop
+        )
+    else:
+        exit_code = asyncio.run(run_cli(sys.argv[1:]))
     sys.exit(exit_code)
 
 
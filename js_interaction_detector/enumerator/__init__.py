@@ -4,10 +4,14 @@ from js_interaction_detector.enumerator.extractor import (
     AccessibilityElement,
     extract_interactive_elements,
 )
-from js_interaction_detector.enumerator.test_generator import generate_enumeration_tests
+from js_interaction_detector.enumerator.test_generator import (
+    generate_enumeration_tests,
+    write_enumeration_tests,
+)
 
 __all__ = [
     "AccessibilityElement",
     "extract_interactive_elements",
     "generate_enumeration_tests",
+    "write_enumeration_tests",
 ]
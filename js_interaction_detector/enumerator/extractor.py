@@ -1,10 +1,13 @@
 """Extract interactive elements from the accessibility tree."""
 
 import logging
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import Any
 
-from playwright.async_api import Page
+from playwright.async_api import CDPSession, Page
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +31,7 @@ INTERACTIVE_ROLES = frozenset(
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessibilityElement:
     """Represents an interactive element from the accessibility tree.
 
@@ -71,40 +74,156 @@ async def extract_accessibility_tree(page: Page) -> dict[str, Any] | None:
         return None
 
 
-def flatten_tree(
-    node: dict[str, Any] | None,
-    elements: list[dict[str, Any]] | None = None,
-) -> list[dict[str, Any]]:
+async def extract_cdp_ax_nodes(
+    page: Page, client: CDPSession | None = None
+) -> list[dict[str, Any]] | None:
+    """Fetch the page's full accessibility tree with one CDP call.
+
+    ``Accessibility.getFullAXTree`` returns every node as a flat list in a
+    single round-trip, with roles and accessible names computed by Chromium.
+
+    Args:
+        page: Playwright Page object (Chromium only)
+        client: An already-attached CDP session for the page to reuse
+            (e.g. the one passed to extract_listeners). If omitted, a
+            session is opened for this call and detached afterwards.
+
+    Returns:
+        The raw CDP AXNode dicts, or None if CDP is unavailable or fails
+    """
+    try:
+        if client is not None:
+            response = await client.send("Accessibility.getFullAXTree")
+        else:
+            client = await page.context.new_cdp_session(page)
+            try:
+                response = await client.send("Accessibility.getFullAXTree")
+            finally:
+                await client.detach()
+    except Exception as e:
+        logger.warning(f"Could not fetch accessibility tree via CDP: {e}")
+        return None
+
+    nodes = response.get("nodes", [])
+    logger.info(f"Fetched {len(nodes)} accessibility nodes via CDP")
+    return nodes
+
+
+def _cdp_value(field: dict[str, Any] | None) -> Any:
+    """Unwrap a CDP AXValue ({"type": ..., "value": ...}) to its value."""
+    return field.get("value") if field else None
+
+
+def _cdp_node_to_snapshot_node(node: dict[str, Any]) -> dict[str, Any]:
+    """Convert a CDP AXNode to the node shape used by accessibility snapshots."""
+    properties = {
+        prop["name"]: _cdp_value(prop.get("value"))
+        for prop in node.get("properties", ())
+    }
+    checked = properties.get("checked")
+    value = _cdp_value(node.get("value"))
+
+    return {
+        "role": _cdp_value(node.get("role")) or "",
+        "name": _cdp_value(node.get("name")) or "",
+        "value": str(value) if value not in (None, "") else None,
+        "checked": {"true": True, "false": False}.get(checked, checked),
+        "disabled": bool(properties.get("disabled", False)),
+        "expanded": properties.get("expanded"),
+    }
+
+
+def iter_cdp_ax_nodes(raw_nodes: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Yield CDP AXNodes as snapshot-style nodes in document (pre-)order.
+
+    Order is rebuilt from ``childIds`` rather than trusting the list order.
+    Ignored nodes (hidden, presentational) are walked through, since their
+    descendants may still be exposed, but are not yielded themselves.
+
+    Args:
+        raw_nodes: AXNode dicts from ``Accessibility.getFullAXTree``
+
+    Yields:
+        Dicts with role, name, value, checked, disabled and expanded keys
+    """
+    by_id = {node["nodeId"]: node for node in raw_nodes}
+    roots = [node for node in raw_nodes if "parentId" not in node]
+    stack = list(reversed(roots))
+
+    while stack:
+        node = stack.pop()
+        child_ids = node.get("childIds")
+        if child_ids:
+            stack.extend(by_id[c] for c in reversed(child_ids) if c in by_id)
+        if not node.get("ignored"):
+            yield _cdp_node_to_snapshot_node(node)
+
+
+def iter_tree(node: dict[str, Any] | None) -> Iterator[dict[str, Any]]:
+    """Yield every node of the accessibility tree in document (pre-)order.
+
+    Walks the tree with an explicit stack rather than recursion, so deeply
+    nested pages cannot hit the interpreter's recursion limit.
+
+    Args:
+        node: The root node of the tree
+
+    Yields:
+        Each node in the tree, parents before their children
+    """
+    stack = [node] if node is not None else []
+
+    while stack:
+        current = stack.pop()
+        yield current
+        children = current.get("children")
+        if children:
+            # Reversed so the first child is popped (and yielded) first
+            stack.extend(reversed(children))
+
+
+def flatten_tree(node: dict[str, Any] | None) -> list[dict[str, Any]]:
     """Flatten the accessibility tree into a list of nodes.
 
     Args:
-        node: The current node in the tree
-        elements: Accumulator list for elements
+        node: The root node of the tree
 
     Returns:
-        List of all nodes in the tree
+        List of all nodes in the tree, in document order
     """
-    if elements is None:
-        elements = []
+    return list(iter_tree(node))
 
-    if node is None:
-        return elements
 
-    elements.append(node)
+def _to_interactive_element(node: dict[str, Any]) -> AccessibilityElement | None:
+    """Build an AccessibilityElement for a node, or None if not interactive."""
+    raw_role = node.get("role") or ""
+    # Roles almost always arrive lowercase already; only normalize the rest
+    role = raw_role if raw_role in INTERACTIVE_ROLES else raw_role.lower()
 
-    for child in node.get("children", []):
-        flatten_tree(child, elements)
+    if role not in INTERACTIVE_ROLES:
+        return None
 
-    return elements
+    # Interning maps the decoded string to the literal in INTERACTIVE_ROLES,
+    # so every element shares it and later dict/Counter lookups on role hit
+    # the identity fast path. Only kept roles are interned: interning before
+    # the membership test would cost a lookup for every node.
+    return AccessibilityElement(
+        role=sys.intern(role),
+        name=node.get("name", ""),
+        value=node.get("value"),
+        checked=node.get("checked"),
+        disabled=node.get("disabled", False),
+        expanded=node.get("expanded"),
+    )
 
 
 def filter_interactive_elements(
-    nodes: list[dict[str, Any]],
+    nodes: Iterable[dict[str, Any]],
 ) -> list[AccessibilityElement]:
     """Filter nodes to only interactive elements with names.
 
     Args:
-        nodes: List of accessibility tree nodes
+        nodes: Accessibility tree nodes
 
     Returns:
         List of AccessibilityElement objects for interactive elements
@@ -112,54 +231,85 @@ def filter_interactive_elements(
     elements = []
 
     for node in nodes:
-        role = node.get("role", "").lower()
+        element = _to_interactive_element(node)
+        if element is not None:
+            elements.append(element)
 
-        if role not in INTERACTIVE_ROLES:
-            continue
+    logger.info("Found %d interactive elements", len(elements))
+    return elements
 
-        element = AccessibilityElement(
-            role=role,
-            name=node.get("name", ""),
-            value=node.get("value"),
-            checked=node.get("checked"),
-            disabled=node.get("disabled", False),
-            expanded=node.get("expanded"),
-        )
 
-        elements.append(element)
+def _collect(
+    nodes: Iterable[dict[str, Any]],
+) -> tuple[list[AccessibilityElement], Counter[str]]:
+    """Build interactive elements and count roles in one pass over nodes."""
+    elements: list[AccessibilityElement] = []
+    role_counts: Counter[str] = Counter()
+    node_count = 0
 
-    logger.info(f"Found {len(elements)} interactive elements")
-    return elements
+    for node in nodes:
+        node_count += 1
+        element = _to_interactive_element(node)
+        if element is not None:
+            elements.append(element)
+            role_counts[element.role] += 1
+
+    logger.info(
+        "Found %d interactive elements in %d total nodes", len(elements), node_count
+    )
+    return elements, role_counts
+
+
+def collect_interactive_elements(
+    tree: dict[str, Any] | None,
+) -> tuple[list[AccessibilityElement], Counter[str]]:
+    """Walk the tree once, building interactive elements and counting roles.
+
+    Equivalent to ``filter_interactive_elements(flatten_tree(tree))`` plus a
+    role tally, but without materializing the intermediate list of nodes.
+
+    Args:
+        tree: The root node of the accessibility tree
+
+    Returns:
+        Tuple of (interactive elements in document order, count per role)
+    """
+    return _collect(iter_tree(tree))
 
 
-async def extract_interactive_elements(page: Page) -> list[AccessibilityElement]:
+async def extract_interactive_elements(
+    page: Page, client: CDPSession | None = None
+) -> list[AccessibilityElement]:
     """Extract all interactive elements from a page's accessibility tree.
 
-    This is the main entry point for accessibility tree extraction.
+    This is the main entry point for accessibility tree extraction. The tree
+    is fetched in one CDP call where possible, falling back to Playwright's
+    accessibility snapshot.
 
     Args:
         page: Playwright Page object
+        client: An already-attached CDP session for the page to reuse
 
     Returns:
         List of AccessibilityElement objects representing interactive elements
     """
-    tree = await extract_accessibility_tree(page)
-
-    if tree is None:
-        logger.warning("No accessibility tree available")
-        return []
+    raw_nodes = await extract_cdp_ax_nodes(page, client)
 
-    nodes = flatten_tree(tree)
-    logger.info(f"Flattened tree contains {len(nodes)} total nodes")
+    if raw_nodes is not None:
+        elements, role_counts = _collect(iter_cdp_ax_nodes(raw_nodes))
+    else:
+        # Non-Chromium browsers: fall back to Playwright's snapshot API
+        tree = await extract_accessibility_tree(page)
 
-    elements = filter_interactive_elements(nodes)
+        if tree is None:
+            logger.warning("No accessibility tree available")
+            return []
 
-    # Log summary by role
-    role_counts: dict[str, int] = {}
-    for el in elements:
-        role_counts[el.role] = role_counts.get(el.role, 0) + 1
+        elements, role_counts = collect_interactive_elements(tree)
 
-    for role, count in sorted(role_counts.items()):
-        logger.info(f"  {role}: {count}")
+    # Log summary by role; skip the sort entirely when INFO is off (CLI default)
+    if logger.isEnabledFor(logging.INFO):
+        for role, count in sorted(role_counts.items()):
+            logger.info("  %s: %d", role, count)
 
     return elements
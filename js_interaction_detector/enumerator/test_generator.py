@@ -1,16 +1,28 @@
 """Generate Playwright tests from accessibility elements."""
 
+import functools
+import io
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import TextIO
 
 from js_interaction_detector.enumerator.extractor import AccessibilityElement
 
 logger = logging.getLogger(__name__)
 
 
+# Backslashes and single quotes, escaped in one pass over the string
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+
+@functools.lru_cache(maxsize=4096)
 def escape_string(s: str) -> str:
     """Escape a string for use in TypeScript single-quoted strings."""
-    return s.replace("\\", "\\\\").replace("'", "\\'")
+    # Most accessible names need no escaping; skip the copy for those
+    if "\\" not in s and "'" not in s:
+        return s
+    return s.translate(_ESCAPE_TABLE)
 
 
 def _get_nth_selector(index: int | None, total: int | None) -> str:
@@ -31,253 +43,161 @@ def _get_nth_selector(index: int | None, total: int | None) -> str:
     return f".nth({index - 1})"
 
 
-def generate_button_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a button element.
-
-    Args:
-        element: The button element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'button "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is interactive', async ({{ page }}) => {{
-    const button = page.getByRole('button', {{ name: '{name}' }}){nth};
-    await expect(button).toBeVisible();
-    await expect(button).toBeEnabled();
-  }});"""
-
-
-def generate_link_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a link element.
-
-    Args:
-        element: The link element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'link "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is present', async ({{ page }}) => {{
-    const link = page.getByRole('link', {{ name: '{name}' }}){nth};
-    await expect(link).toBeVisible();
-    await expect(link).toHaveAttribute('href', /.+/);
-  }});"""
-
-
-def generate_textbox_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a textbox element.
-
-    Args:
-        element: The textbox element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    role = element.role  # Could be 'textbox' or 'searchbox'
-    test_name = f'{role} "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} accepts input', async ({{ page }}) => {{
-    const input = page.getByRole('{role}', {{ name: '{name}' }}){nth};
-    await expect(input).toBeVisible();
+# Per-role test shape: (predicate in the test title, locator variable name,
+# body statements using that variable). Roles not listed use _GENERIC_TEMPLATE.
+_TEMPLATES: dict[str, tuple[str, str, str]] = {
+    "button": (
+        "is interactive",
+        "button",
+        """    await expect(button).toBeVisible();
+    await expect(button).toBeEnabled();""",
+    ),
+    "link": (
+        "is present",
+        "link",
+        """    await expect(link).toBeVisible();
+    await expect(link).toHaveAttribute('href', /.+/);""",
+    ),
+    "textbox": (
+        "accepts input",
+        "input",
+        """    await expect(input).toBeVisible();
     await expect(input).toBeEditable();
     await input.fill('test input');
-    await expect(input).toHaveValue('test input');
-  }});"""
-
-
-def generate_checkbox_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a checkbox element.
-
-    Args:
-        element: The checkbox element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'checkbox "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is toggleable', async ({{ page }}) => {{
-    const checkbox = page.getByRole('checkbox', {{ name: '{name}' }}){nth};
-    await expect(checkbox).toBeVisible();
+    await expect(input).toHaveValue('test input');""",
+    ),
+    "checkbox": (
+        "is toggleable",
+        "checkbox",
+        """    await expect(checkbox).toBeVisible();
     await checkbox.check();
-    await expect(checkbox).toBeChecked();
-  }});"""
-
-
-def generate_radio_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a radio button element.
-
-    Args:
-        element: The radio element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'radio "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
+    await expect(checkbox).toBeChecked();""",
+    ),
     # Note: Many UI frameworks hide the actual radio input and style a wrapper.
-    # We just verify the radio exists in the accessibility tree - interaction testing
-    # would require framework-specific knowledge of the wrapper structure.
-    return f"""  test('{escape_string(test_name)} exists', async ({{ page }}) => {{
-    const radio = page.getByRole('radio', {{ name: '{name}' }}){nth};
-    await expect(radio).toBeAttached();
-  }});"""
+    # We just verify the radio exists in the accessibility tree - interaction
+    # testing would require framework-specific knowledge of the wrapper structure.
+    "radio": (
+        "exists",
+        "radio",
+        """    await expect(radio).toBeAttached();""",
+    ),
+    "combobox": (
+        "is interactive",
+        "combobox",
+        """    await expect(combobox).toBeVisible();
+    await expect(combobox).toBeEnabled();""",
+    ),
+    "slider": (
+        "is adjustable",
+        "slider",
+        """    await expect(slider).toBeVisible();
+    await expect(slider).toBeEnabled();""",
+    ),
+    "switch": (
+        "is toggleable",
+        "switchEl",
+        """    await expect(switchEl).toBeVisible();
+    await switchEl.click();""",
+    ),
+    "tab": (
+        "is selectable",
+        "tab",
+        """    await expect(tab).toBeVisible();
+    await tab.click();""",
+    ),
+}
+_TEMPLATES["searchbox"] = _TEMPLATES["textbox"]
 
+_GENERIC_TEMPLATE = (
+    "is interactive",
+    "el",
+    """    await expect(el).toBeVisible();""",
+)
 
-def generate_combobox_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a combobox element.
 
-    Args:
-        element: The combobox element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
+@functools.cache
+def _role_template(role: str, generic: bool = False) -> str:
+    """Build the %-format template for a role's test, once per role.
 
-    Returns:
-        TypeScript test code
+    The template takes (name, index suffix, name, nth selector); everything
+    else, including the role itself, is baked in. With ``generic``, the
+    generic "is interactive" test is used even for roles with their own.
     """
+    predicate, var, body = (
+        _GENERIC_TEMPLATE if generic else _TEMPLATES.get(role, _GENERIC_TEMPLATE)
+    )
+    role = role.replace("%", "%%")
+    return (
+        f"  test('{role} \"%s\"%s {predicate}', async ({{ page }}) => {{\n"
+        f"    const {var} = page.getByRole('{role}', {{ name: '%s' }})%s;\n"
+        f"{body}\n"
+        "  });"
+    )
+
+
+def _render_role_test(
+    role: str,
+    element: AccessibilityElement,
+    index: int | None,
+    total: int | None,
+    generic: bool = False,
+) -> str:
+    """Render the test for an element using the given role's template."""
     name = escape_string(element.name)
-    test_name = f'combobox "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
+    suffix = f" ({index})" if index is not None else ""
     nth = _get_nth_selector(index, total)
 
-    return f"""  test('{escape_string(test_name)} is interactive', async ({{ page }}) => {{
-    const combobox = page.getByRole('combobox', {{ name: '{name}' }}){nth};
-    await expect(combobox).toBeVisible();
-    await expect(combobox).toBeEnabled();
-  }});"""
+    return _role_template(role, generic) % (name, suffix, name, nth)
 
 
-def generate_slider_test(
+def generate_role_test(
     element: AccessibilityElement, index: int | None = None, total: int | None = None
 ) -> str:
-    """Generate test code for a slider element.
+    """Generate test code for an interactive element of any role.
 
     Args:
-        element: The slider element
+        element: The element
         index: Optional index if there are duplicates (1-based)
         total: Total number of elements with same name
 
     Returns:
         TypeScript test code
     """
-    name = escape_string(element.name)
-    test_name = f'slider "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is adjustable', async ({{ page }}) => {{
-    const slider = page.getByRole('slider', {{ name: '{name}' }}){nth};
-    await expect(slider).toBeVisible();
-    await expect(slider).toBeEnabled();
-  }});"""
-
-
-def generate_switch_test(
-    element: AccessibilityElement, index: int | None = None, total: int | None = None
-) -> str:
-    """Generate test code for a switch element.
+    return _render_role_test(element.role, element, index, total)
 
-    Args:
-        element: The switch element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
 
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'switch "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
+def _fixed_role_test(role: str) -> Callable[..., str]:
+    """Make a generator that always renders the given role's test."""
 
-    nth = _get_nth_selector(index, total)
+    def generate(
+        element: AccessibilityElement,
+        index: int | None = None,
+        total: int | None = None,
+    ) -> str:
+        return _render_role_test(role, element, index, total)
 
-    return f"""  test('{escape_string(test_name)} is toggleable', async ({{ page }}) => {{
-    const switchEl = page.getByRole('switch', {{ name: '{name}' }}){nth};
-    await expect(switchEl).toBeVisible();
-    await switchEl.click();
-  }});"""
+    generate.__name__ = generate.__qualname__ = f"generate_{role}_test"
+    generate.__doc__ = f"Generate test code for a {role} element."
+    return generate
 
 
-def generate_tab_test(
+def generate_textbox_test(
     element: AccessibilityElement, index: int | None = None, total: int | None = None
 ) -> str:
-    """Generate test code for a tab element.
+    """Generate test code for a textbox element, keeping the searchbox role."""
+    role = "searchbox" if element.role == "searchbox" else "textbox"
+    return _render_role_test(role, element, index, total)
 
-    Args:
-        element: The tab element
-        index: Optional index if there are duplicates (1-based)
-        total: Total number of elements with same name
-
-    Returns:
-        TypeScript test code
-    """
-    name = escape_string(element.name)
-    test_name = f'tab "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
 
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is selectable', async ({{ page }}) => {{
-    const tab = page.getByRole('tab', {{ name: '{name}' }}){nth};
-    await expect(tab).toBeVisible();
-    await tab.click();
-  }});"""
+# Per-role generators: each renders its own role, whatever element.role says
+generate_button_test = _fixed_role_test("button")
+generate_link_test = _fixed_role_test("link")
+generate_checkbox_test = _fixed_role_test("checkbox")
+generate_radio_test = _fixed_role_test("radio")
+generate_combobox_test = _fixed_role_test("combobox")
+generate_slider_test = _fixed_role_test("slider")
+generate_switch_test = _fixed_role_test("switch")
+generate_tab_test = _fixed_role_test("tab")
 
 
 def generate_generic_test(
@@ -285,6 +205,9 @@ def generate_generic_test(
 ) -> str:
     """Generate test code for other interactive elements.
 
+    Always renders the generic "is interactive" test for the element's own
+    role, even for roles that have a specific test (see generate_role_test).
+
     Args:
         element: The element
         index: Optional index if there are duplicates (1-based)
@@ -293,57 +216,69 @@ def generate_generic_test(
     Returns:
         TypeScript test code
     """
-    name = escape_string(element.name)
-    role = element.role
-    test_name = f'{role} "{element.name}"'
-    if index is not None:
-        test_name += f" ({index})"
-
-    nth = _get_nth_selector(index, total)
-
-    return f"""  test('{escape_string(test_name)} is interactive', async ({{ page }}) => {{
-    const el = page.getByRole('{role}', {{ name: '{name}' }}){nth};
-    await expect(el).toBeVisible();
-  }});"""
-
-
-# Map roles to their test generators
-TEST_GENERATORS = {
-    "button": generate_button_test,
-    "link": generate_link_test,
-    "textbox": generate_textbox_test,
-    "searchbox": generate_textbox_test,
-    "checkbox": generate_checkbox_test,
-    "radio": generate_radio_test,
-    "combobox": generate_combobox_test,
-    "slider": generate_slider_test,
-    "switch": generate_switch_test,
-    "tab": generate_tab_test,
+    return _render_role_test(element.role, element, index, total, generic=True)
+
+
+# Order of roles in the generated file, for consistent output
+_ROLE_ORDER = (
+    "button",
+    "link",
+    "textbox",
+    "searchbox",
+    "checkbox",
+    "radio",
+    "combobox",
+    "slider",
+    "switch",
+    "tab",
+    "menuitem",
+    "option",
+    "spinbutton",
+)
+
+# describe() block titles; other roles get a pluralized title-case name
+_ROLE_DISPLAY = {
+    "textbox": "Text Inputs",
+    "searchbox": "Search Inputs",
+    "checkbox": "Checkboxes",
+    "radio": "Radio Buttons",
+    "combobox": "Comboboxes",
+    "slider": "Sliders",
+    "switch": "Switches",
+    "tab": "Tabs",
+    "menuitem": "Menu Items",
+    "option": "Options",
+    "spinbutton": "Spin Buttons",
 }
 
 
-def generate_enumeration_tests(
+def _emit_enumeration_tests(
     url: str,
     elements: list[AccessibilityElement],
-) -> tuple[str, list[str]]:
-    """Generate a complete Playwright test file from accessibility elements.
+    write: Callable[[str], object],
+) -> list[str]:
+    """Write a complete Playwright test file piece by piece through write.
 
     Args:
         url: The URL of the page being tested
         elements: List of AccessibilityElement objects
+        write: Called with each chunk of the file, in order
 
     Returns:
-        Tuple of (test file content, list of warning messages)
+        List of warning messages
     """
     warnings: list[str] = []
 
-    # Separate elements with and without names
-    named_elements: list[AccessibilityElement] = []
-    unnamed_counts: dict[str, int] = defaultdict(int)
+    # One pass: group named elements by role, counting each name per role,
+    # and count unnamed elements per role
+    by_role: dict[str, list[AccessibilityElement]] = defaultdict(list)
+    name_counts: dict[str, Counter[str]] = defaultdict(Counter)
+    unnamed_counts: Counter[str] = Counter()
 
     for el in elements:
         if el.has_name():
-            named_elements.append(el)
+            by_role[el.role].append(el)
+            name_counts[el.role][el.name] += 1
         else:
             unnamed_counts[el.role] += 1
 
@@ -355,96 +290,86 @@ def generate_enumeration_tests(
         )
         logger.warning(warnings[-1])
 
-    # Group elements by role
-    by_role: dict[str, list[AccessibilityElement]] = defaultdict(list)
-    for el in named_elements:
-        by_role[el.role].append(el)
-
-    # Track duplicate names within each role
-    def get_name_indices(
-        elements: list[AccessibilityElement],
-    ) -> dict[str, list[int]]:
-        """Get indices of elements with duplicate names."""
-        name_indices: dict[str, list[int]] = defaultdict(list)
-        for i, el in enumerate(elements):
-            name_indices[el.name].append(i)
-        return name_indices
-
-    # Generate test sections
-    test_sections: list[str] = []
-
-    # Define order of roles for consistent output
-    role_order = [
-        "button",
-        "link",
-        "textbox",
-        "searchbox",
-        "checkbox",
-        "radio",
-        "combobox",
-        "slider",
-        "switch",
-        "tab",
-        "menuitem",
-        "option",
-        "spinbutton",
-    ]
-
-    for role in role_order:
+    write(
+        "import { test, expect } from '@playwright/test';\n"
+        "\n"
+        "test.describe('Accessibility Elements', () => {\n"
+        "  test.beforeEach(async ({ page }) => {\n"
+        f"    await page.goto('{url}');\n"
+        "  });\n"
+        "\n"
+    )
+    wrote_section = False
+
+    for role in _ROLE_ORDER:
         if role not in by_role:
             continue
 
-        role_elements = by_role[role]
-        name_indices = get_name_indices(role_elements)
+        role_name_counts = name_counts[role]
+        # Running position of each duplicated name (1-based)
+        seen: Counter[str] = Counter()
 
         # Determine display name for the role in describe block
-        role_display = {
-            "textbox": "Text Inputs",
-            "searchbox": "Search Inputs",
-            "checkbox": "Checkboxes",
-            "radio": "Radio Buttons",
-            "combobox": "Comboboxes",
-            "slider": "Sliders",
-            "switch": "Switches",
-            "tab": "Tabs",
-            "menuitem": "Menu Items",
-            "option": "Options",
-            "spinbutton": "Spin Buttons",
-        }.get(role, f"{role.title()}s")
-
-        tests: list[str] = []
-        generator = TEST_GENERATORS.get(role, generate_generic_test)
-
-        for i, el in enumerate(role_elements):
-            # Determine if we need to add index for duplicates
-            indices = name_indices[el.name]
-            if len(indices) > 1:
-                # Find position within duplicates (1-based)
-                pos = indices.index(i) + 1
-                total = len(indices)
-                test_code = generator(el, index=pos, total=total)
+        role_display = _ROLE_DISPLAY.get(role) or f"{role.title()}s"
+        write(f"  test.describe('{role_display}', () => {{\n")
+
+        for el in by_role[role]:
+            # Add an index for duplicates
+            total = role_name_counts[el.name]
+            if total > 1:
+                seen[el.name] += 1
+                write(generate_role_test(el, seen[el.name], total))
             else:
-                test_code = generator(el)
+                write(generate_role_test(el, None, None))
+            write("\n")
+
+        write("  });\n")
+        wrote_section = True
+
+    if not wrote_section:
+        # Keep the empty line between the hook and the closing brace
+        write("\n")
+    write("});\n")
+
+    named_count = sum(len(role_elements) for role_elements in by_role.values())
+    logger.info(f"Generated tests for {named_count} elements")
+    return warnings
 
-            tests.append(test_code)
 
-        if tests:
-            section = f"""  test.describe('{role_display}', () => {{
-{chr(10).join(tests)}
-  }});"""
-            test_sections.append(section)
+def generate_enumeration_tests(
+    url: str,
+    elements: list[AccessibilityElement],
+) -> tuple[str, list[str]]:
+    """Generate a complete Playwright test file from accessibility elements.
 
-    # Assemble complete test file
-    test_content = f"""import {{ test, expect }} from '@playwright/test';
+    Args:
+        url: The URL of the page being tested
+        elements: List of AccessibilityElement objects
 
-test.describe('Accessibility Elements', () => {{
-  test.beforeEach(async ({{ page }}) => {{
-    await page.goto('{url}');
-  }});
+    Returns:
+        Tuple of (test file content, list of warning messages)
+    """
+    buffer = io.StringIO()
+    warnings = _emit_enumeration_tests(url, elements, buffer.write)
+    return buffer.getvalue(), warnings
 
-{chr(10).join(test_sections)}
-}});
-"""
 
-    logger.info(f"Generated tests for {len(named_elements)} elements")
-    return test_content, warnings
+def write_enumeration_tests(
+    url: str,
+    elements: list[AccessibilityElement],
+    out: TextIO,
+) -> list[str]:
+    """Write a complete Playwright test file straight to a text stream.
+
+    Same output as generate_enumeration_tests, without holding the whole
+    file in memory.
+
+    Args:
+        url: The URL of the page being tested
+        elements: List of AccessibilityElement objects
+        out: Writable text stream, e.g. an open file
+
+    Returns:
+        List of warning messages
+    """
+    return _emit_enumeration_tests(url, elements, out.write)
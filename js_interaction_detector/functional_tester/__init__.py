@@ -21,6 +21,7 @@ from js_interaction_detector.functional_tester.usage_detector import (
     detect_usage,
     find_call_sites,
     find_imports,
+    iter_usage,
 )
 
 __all__ = [
@@ -35,6 +36,7 @@ __all__ = [
     "find_imports",
     "find_call_sites",
     "detect_usage",
+    "iter_usage",
     # Instrumentation
     "generate_wrapper",
     "generate_instrumentation_script",
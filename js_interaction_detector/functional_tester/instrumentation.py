@@ -5,52 +5,56 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def generate_wrapper(function_name: str, library: str) -> str:
-    """Generate a wrapper function that captures inputs/outputs.
-
-    The wrapper logs executable test code to the console.
-
-    Args:
-        function_name: Name of the function to wrap
-        library: The library name
-
-    Returns:
-        JavaScript code for the wrapper
-    """
-    return f"""
-(function() {{
-  const originalFn = {function_name};
-  {function_name} = function(...args) {{
+# Wrapper body shared by every function; __FN__ is replaced with its name
+_WRAPPER_TEMPLATE = """
+(function() {
+  const originalFn = __FN__;
+  __FN__ = function(...args) {
     const result = originalFn.apply(this, args);
 
-    try {{
-      const serializedArgs = args.map(arg => {{
-        if (typeof arg === 'function') {{
+    try {
+      const serializedArgs = args.map(arg => {
+        if (typeof arg === 'function') {
           // Try to capture simple arrow functions
           const fnStr = arg.toString();
-          if (fnStr.includes('=>') && !fnStr.includes('{{')) {{
+          if (fnStr.includes('=>') && !fnStr.includes('{')) {
             return fnStr;
-          }}
+          }
           return '/* function: ' + (arg.name || 'anonymous') + ' */';
-        }}
+        }
         return JSON.stringify(arg);
-      }});
+      });
 
       const serializedResult = JSON.stringify(result);
       const argsStr = serializedArgs.join(', ');
 
       console.log('// Test captured from runtime:');
-      console.log(`expect({function_name}(${{argsStr}})).toEqual(${{serializedResult}});`);
-    }} catch (e) {{
-      console.log('// Could not serialize call to {function_name}:', e.message);
-    }}
+      console.log(`expect(__FN__(${argsStr})).toEqual(${serializedResult});`);
+    } catch (e) {
+      console.log('// Could not serialize call to __FN__:', e.message);
+    }
 
     return result;
-  }};
-}})();
+  };
+})();
 """
 
 
+def generate_wrapper(function_name: str, library: str) -> str:
+    """Generate a wrapper function that captures inputs/outputs.
+
+    The wrapper logs executable test code to the console.
+
+    Args:
+        function_name: Name of the function to wrap
+        library: The library name
+
+    Returns:
+        JavaScript code for the wrapper
+    """
+    return _WRAPPER_TEMPLATE.replace("__FN__", function_name)
+
+
 def generate_instrumentation_script(
     library: str,
     function_names: list[str],
@@ -66,10 +70,6 @@ def generate_instrumentation_script(
     """
     logger.info(f"Generating instrumentation for {len(function_names)} functions")
 
-    wrappers = []
-    for fn in function_names:
-        wrappers.append(generate_wrapper(fn, library))
-
     header = f"""
 // Instrumentation for {library}
 // Paste this into your browser console or inject into your dev environment
@@ -80,4 +80,6 @@ console.log('Interact with your app. Test code will appear below.');
 console.log('');
 """
 
-    return header + "\n".join(wrappers)
+    return header + "\n".join(
+        _WRAPPER_TEMPLATE.replace("__FN__", fn) for fn in function_names
+    )
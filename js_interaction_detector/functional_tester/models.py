@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FunctionSignature:
     """A function signature from type definitions."""
 
@@ -13,7 +13,7 @@ class FunctionSignature:
     module: str  # e.g., "lodash", "lodash/groupBy"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CallSite:
     """A location where a library function is called."""
 
@@ -24,13 +24,18 @@ class CallSite:
     has_static_args: bool  # True if all args are literals
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CapturedCall:
     """A captured function call with inputs and outputs."""
 
     function_name: str
-    inputs: list[str]  # JSON-serialized inputs
+    inputs: tuple[str, ...]  # JSON-serialized inputs
     output: str  # JSON-serialized output
     location: str  # file:line where originally called
     is_complete: bool  # False if some inputs couldn't be captured
     incomplete_reason: str | None = None
+
+    def __post_init__(self):
+        # Store inputs as a tuple so (function_name, inputs) can be hashed
+        if not isinstance(self.inputs, tuple):
+            object.__setattr__(self, "inputs", tuple(self.inputs))
@@ -6,6 +6,9 @@ from js_interaction_detector.functional_tester.models import CapturedCall
 
 logger = logging.getLogger(__name__)
 
+# Backslashes and backticks, escaped in one pass for template literals
+_BACKTICK_TABLE = str.maketrans({"\\": "\\\\", "`": "\\`"})
+
 
 def generate_test_case(call: CapturedCall, library: str) -> str:
     """Generate a single Jest test case from a captured call.
@@ -49,19 +52,27 @@ To fix: Replace this test with concrete inputs and expected output
 """
 
     # Escape backticks and backslashes in the error message
-    error_message = error_message.replace("\\", "\\\\").replace("`", "\\`")
+    error_message = error_message.translate(_BACKTICK_TABLE)
 
     return f"""  test('{test_name}', () => {{
     throw new Error(`{error_message}`);
   }});"""
 
 
-def generate_test_file(library: str, calls: list[CapturedCall]) -> str:
+def generate_test_file(
+    library: str,
+    calls: list[CapturedCall],
+    function_names: list[str] | None = None,
+) -> str:
     """Generate a complete Jest test file from captured calls.
 
     Args:
         library: The library name
         calls: List of captured function calls
+        function_names: Names to import, in order. Callers that already
+            track the functions they captured (e.g. the sorted names from
+            usage detection) can pass them to skip collecting and sorting
+            them here. Defaults to the sorted names found in calls.
 
     Returns:
         Complete Jest test file as a string
@@ -71,7 +82,8 @@ def generate_test_file(library: str, calls: list[CapturedCall]) -> str:
     logger.info(f"Deduplicated {len(calls)} calls to {len(unique_calls)} unique tests")
 
     # Collect function names for imports
-    function_names = sorted({c.function_name for c in unique_calls})
+    if function_names is None:
+        function_names = sorted({c.function_name for c in unique_calls})
     imports_str = ", ".join(function_names)
 
     # Generate test cases
@@ -94,11 +106,13 @@ def _deduplicate_calls(calls: list[CapturedCall]) -> list[CapturedCall]:
 
     Keeps the first occurrence of each unique (function, inputs) pair.
     """
-    seen: dict[tuple, CapturedCall] = {}
+    seen: set[tuple[str, tuple[str, ...]]] = set()
+    unique: list[CapturedCall] = []
 
     for call in calls:
-        key = (call.function_name, tuple(call.inputs))
+        key = (call.function_name, call.inputs)
         if key not in seen:
-            seen[key] = call
+            seen.add(key)
+            unique.append(call)
 
-    return list(seen.values())
+    return unique
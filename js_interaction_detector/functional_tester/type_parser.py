@@ -18,9 +18,6 @@ FUNCTION_PATTERN = re.compile(
     re.MULTILINE,
 )
 
-# Regex to match individual parameters: name: type
-PARAM_PATTERN = re.compile(r"(\w+)\s*:\s*([^,]+)")
-
 
 def parse_dts_file(path: Path) -> list[FunctionSignature]:
     """Parse a .d.ts file and extract function signatures.
@@ -32,7 +29,9 @@ def parse_dts_file(path: Path) -> list[FunctionSignature]:
         List of FunctionSignature objects
     """
     logger.info(f"Parsing type definitions from {path}")
-    content = path.read_text()
+    # Decode directly: the patterns tolerate "\r\n", so universal-newline
+    # translation is wasted work on large bundled definition files
+    content = path.read_bytes().decode("utf-8")
     return parse_dts_content(content, module=path.stem)
 
 
@@ -49,17 +48,21 @@ def parse_dts_content(content: str, module: str = "") -> list[FunctionSignature]
     signatures = []
 
     for match in FUNCTION_PATTERN.finditer(content):
-        name = match.group(1)
-        params_str = match.group(2).strip()
-        return_type = match.group(3).strip()
+        name, params_str, return_type = match.groups()
+        params_str = params_str.strip()
+        return_type = return_type.strip()
 
         # Parse parameters
         parameters = []
         if params_str:
-            for param_match in PARAM_PATTERN.finditer(params_str):
-                param_name = param_match.group(1)
-                param_type = param_match.group(2).strip()
-                parameters.append((param_name, param_type))
+            for part in params_str.split(","):
+                param_name, _, param_type = part.partition(":")
+                # Rest params ("...args") keep just their name; untyped and
+                # optional ("a?") params are skipped
+                param_name = param_name.strip().removeprefix("...")
+                param_type = param_type.strip()
+                if param_name.isidentifier() and param_type:
+                    parameters.append((param_name, param_type))
 
         sig = FunctionSignature(
             name=name,
@@ -1,26 +1,49 @@
 # js_interaction_detector/functional_tester/usage_detector.py
 """Detect library usage in JavaScript/TypeScript source files."""
 
+import bisect
+import functools
 import logging
+import mmap
+import os
 import re
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 from js_interaction_detector.functional_tester.models import CallSite
 
 logger = logging.getLogger(__name__)
 
-# ES module import: import { a, b } from 'library'
-ES_IMPORT_PATTERN = re.compile(
-    r"import\s*\{([^}]+)\}\s*from\s*['\"]([^'\"]+)['\"]",
-    re.MULTILINE,
+# A static argument: a string, number, boolean/null, array or object
+# literal, or a single-expression arrow function (no braces)
+STATIC_ARG_PATTERN = re.compile(
+    r"""['"`].*|-?\d+\.?\d*|true|false|null|undefined|\[.*\]|\{.*\}|[^{]*=>[^{]*""",
+    re.DOTALL,
 )
 
-# CommonJS require: const x = require('library') or const { a } = require('library')
-COMMONJS_PATTERN = re.compile(
-    r"(?:const|let|var)\s+(?:(\w+)|{([^}]+)})\s*=\s*require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)",
+# Below this many files, scanning serially beats starting a process pool
+PARALLEL_MIN_FILES = 64
+
+# Larger sources (typically checked-in minified bundles) are not scanned
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+# Either an ES module import: import { a, b } from 'library'
+# or a CommonJS require: const x = require('library') or
+# const { a } = require('library'). One alternation scans each file once.
+IMPORT_PATTERN = re.compile(
+    r"import\s*\{(?P<es_names>[^}]+)\}\s*from\s*['\"](?P<es_lib>[^'\"]+)['\"]"
+    r"|(?:const|let|var)\s+(?:(?P<cjs_default>\w+)|\{(?P<cjs_names>[^}]+)\})"
+    r"\s*=\s*require\s*\(\s*['\"](?P<cjs_lib>[^'\"]+)['\"]\s*\)",
     re.MULTILINE,
 )
 
+# Arguments of a call, up to its closing paren on the same line. This is
+# simplified - a real parser would handle nested parens better
+CALL_ARGS_PATTERN = re.compile(r"([^)\n]*(?:\([^)\n]*\)[^)\n]*)*)\)")
+
 
 def find_imports(content: str, library: str) -> set[str]:
     """Find all function names imported from a library.
@@ -33,14 +56,19 @@ def find_imports(content: str, library: str) -> set[str]:
         Set of imported function names
     """
     imports = set()
+    library_prefix = f"{library}/"
 
-    # Check ES module imports
-    for match in ES_IMPORT_PATTERN.finditer(content):
-        import_names = match.group(1)
-        from_lib = match.group(2)
+    for match in IMPORT_PATTERN.finditer(content):
+        es_names, es_lib, default_import, cjs_names, cjs_lib = match.groups()
+        from_lib = es_lib or cjs_lib
+        if from_lib != library and not from_lib.startswith(library_prefix):
+            continue
 
-        if from_lib == library or from_lib.startswith(f"{library}/"):
-            # Parse the imported names
+        if default_import:
+            imports.add(default_import)
+        # Parse the imported (or destructured) names
+        import_names = es_names or cjs_names
+        if import_names:
             for name in import_names.split(","):
                 name = name.strip()
                 # Handle "original as alias" syntax
@@ -49,30 +77,13 @@ def find_imports(content: str, library: str) -> set[str]:
                 if name:
                     imports.add(name)
 
-    # Check CommonJS requires
-    for match in COMMONJS_PATTERN.finditer(content):
-        default_import = match.group(1)
-        destructured = match.group(2)
-        from_lib = match.group(3)
-
-        if from_lib == library or from_lib.startswith(f"{library}/"):
-            if default_import:
-                imports.add(default_import)
-            if destructured:
-                for name in destructured.split(","):
-                    name = name.strip()
-                    if " as " in name:
-                        name = name.split(" as ")[0].strip()
-                    if name:
-                        imports.add(name)
-
     logger.info(f"Found {len(imports)} imports from {library}: {imports}")
     return imports
 
 
 def find_call_sites(
     content: str,
-    function_names: set[str],
+    function_names: set[str] | frozenset[str],
     file_path: str,
 ) -> list[CallSite]:
     """Find call sites for specific functions.
@@ -83,112 +94,221 @@ def find_call_sites(
         file_path: Path to the source file (for location tracking)
 
     Returns:
-        List of CallSite objects
+        List of CallSite objects, in source order
     """
     call_sites = []
-    lines = content.split("\n")
-
-    for func_name in function_names:
-        # Pattern to match function call: funcName(...)
-        # This is simplified - a real parser would handle nested parens better
-        call_pattern = re.compile(
-            rf"\b{re.escape(func_name)}\s*\(([^)]*(?:\([^)]*\)[^)]*)*)\)",
-            re.MULTILINE,
-        )
+    if not function_names:
+        return call_sites
+
+    # One pass over the file finds every call start, for all names at once
+    call_start = _call_start_pattern(frozenset(function_names))
+    newline_offsets = _newline_offsets(content)
+    # End of the last call matched per name: a call nested inside another
+    # call to the same function is part of that call's arguments
+    last_end: dict[str, int] = {}
+
+    for start_match in call_start.finditer(content):
+        # Interned so the many call sites of one function share a name string
+        func_name = sys.intern(start_match.group(1))
+        if start_match.start() < last_end.get(func_name, 0):
+            continue
+
+        # Arguments must close on the same line
+        args_match = CALL_ARGS_PATTERN.match(content, start_match.end())
+        if args_match is None:
+            continue
+        last_end[func_name] = args_match.end()
 
-        for line_num, line in enumerate(lines, start=1):
-            for match in call_pattern.finditer(line):
-                args_str = match.group(1)
-                arguments = _parse_arguments(args_str)
+        args_str = args_match.group(1)
+        arguments = _parse_arguments(args_str)
 
-                # Determine if args are static (literals or simple lambdas)
-                has_static = _are_args_static(arguments)
+        # Determine if args are static (literals or simple lambdas)
+        has_static = _are_args_static(arguments)
 
-                call_site = CallSite(
-                    function_name=func_name,
-                    file_path=file_path,
-                    line_number=line_num,
-                    arguments=arguments,
-                    has_static_args=has_static,
-                )
-                call_sites.append(call_site)
-                logger.debug(f"Found call: {func_name} at {file_path}:{line_num}")
+        line_num = bisect.bisect_right(newline_offsets, start_match.start()) + 1
+        call_site = CallSite(
+            function_name=func_name,
+            file_path=file_path,
+            line_number=line_num,
+            arguments=arguments,
+            has_static_args=has_static,
+        )
+        call_sites.append(call_site)
+        logger.debug(f"Found call: {func_name} at {file_path}:{line_num}")
 
     logger.info(f"Found {len(call_sites)} call sites in {file_path}")
     return call_sites
 
 
+@functools.lru_cache(maxsize=256)
+def _call_start_pattern(function_names: frozenset[str]) -> re.Pattern[str]:
+    """Compile the pattern matching the start of a call to any of the names.
+
+    Cached because every file importing the same functions needs the same
+    pattern. Only "name(" is matched, so calls nested in another call's
+    arguments are still found.
+    """
+    alternation = "|".join(map(re.escape, sorted(function_names)))
+    return re.compile(rf"\b({alternation})[^\S\n]*\(")
+
+
+def _newline_offsets(content: str) -> list[int]:
+    """Get the offset of every newline in content, in increasing order."""
+    offsets = []
+    i = content.find("\n")
+    while i != -1:
+        offsets.append(i)
+        i = content.find("\n", i + 1)
+    return offsets
+
+
+# Character classes for _parse_arguments; every other character is 0
+_OPEN, _CLOSE, _COMMA, _QUOTE = 1, 2, 3, 4
+_CHAR_CLASS = {
+    **dict.fromkeys("([{", _OPEN),
+    **dict.fromkeys(")]}", _CLOSE),
+    ",": _COMMA,
+    **dict.fromkeys("\"'`", _QUOTE),
+}
+
+
 def _parse_arguments(args_str: str) -> list[str]:
     """Parse argument string into individual arguments.
 
-    Handles nested structures and arrow functions.
+    Handles nested structures and arrow functions. Only the positions of
+    top-level commas are tracked; each argument is sliced out once.
     """
     if not args_str.strip():
         return []
 
     arguments = []
-    current = ""
+    start = 0
     depth = 0
-    in_string = False
     string_char = None
+    escaped = False
+    char_class = _CHAR_CLASS.get
+
+    for i, char in enumerate(args_str):
+        if string_char is not None:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == string_char:
+                string_char = None
+            continue
 
-    for char in args_str:
-        if in_string:
-            current += char
-            if char == string_char and current[-2:] != f"\\{char}":
-                in_string = False
-        elif char in "\"'`":
-            in_string = True
+        # One lookup classifies the character; ordinary ones exit here
+        cls = char_class(char, 0)
+        if not cls:
+            continue
+        if cls == _QUOTE:
             string_char = char
-            current += char
-        elif char in "([{":
+        elif cls == _OPEN:
             depth += 1
-            current += char
-        elif char in ")]}":
+        elif cls == _CLOSE:
             depth -= 1
-            current += char
-        elif char == "," and depth == 0:
-            if current.strip():
-                arguments.append(current.strip())
-            current = ""
-        else:
-            current += char
+        elif depth == 0:
+            argument = args_str[start:i].strip()
+            if argument:
+                arguments.append(argument)
+            start = i + 1
 
-    if current.strip():
-        arguments.append(current.strip())
+    argument = args_str[start:].strip()
+    if argument:
+        arguments.append(argument)
 
     return arguments
 
 
 def _are_args_static(arguments: list[str]) -> bool:
     """Check if all arguments are static (literals or simple lambdas)."""
-    for arg in arguments:
-        arg = arg.strip()
-        # Skip empty args
-        if not arg:
-            continue
-        # String literals
-        if arg.startswith(("'", '"', "`")):
-            continue
-        # Number literals
-        if re.match(r"^-?\d+\.?\d*$", arg):
-            continue
-        # Boolean/null literals
-        if arg in ("true", "false", "null", "undefined"):
-            continue
-        # Array literals
-        if arg.startswith("[") and arg.endswith("]"):
-            continue
-        # Object literals
-        if arg.startswith("{") and arg.endswith("}"):
-            continue
-        # Simple arrow functions (single expression)
-        if "=>" in arg and "{" not in arg:
-            continue
-        # Variable reference - not static
-        return False
+    return all(
+        not arg or STATIC_ARG_PATTERN.fullmatch(arg)
+        for arg in map(str.strip, arguments)
+    )
+
+
+def _iter_sources(root: str | Path, extensions: tuple[str, ...]) -> Iterator[str]:
+    """Yield paths of source files under root, skipping node_modules.
+
+    Uses os.scandir so names and file types come from the directory listing
+    itself, and prunes node_modules directories without descending into them.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != "node_modules":
+                    yield from _iter_sources(entry.path, extensions)
+            elif entry.name.endswith(extensions) and entry.is_file():
+                yield entry.path
+
+
+def _scan_one(file_path: str, library: str) -> list[CallSite]:
+    """Find the library's call sites in one file (top-level so it pickles).
+
+    The file is memory-mapped and searched for the library name as bytes,
+    so files that never mention it are skipped without being decoded.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []  # mmap can't map an empty file
+            if size > MAX_SOURCE_BYTES:
+                logger.info(f"Skipping {file_path}: {size} bytes is too large")
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Any import of the library must spell its name out literally
+                if mm.find(library.encode()) == -1:
+                    return []
+                content = mm[:].decode("utf-8", "replace")
+        imports = find_imports(content, library)
+        if imports:
+            return find_call_sites(content, frozenset(imports), file_path)
+    except Exception as e:
+        logger.warning(f"Failed to parse {file_path}: {e}")
+    return []
+
+
+def iter_usage(
+    source_dir: Path,
+    library: str,
+    extensions: tuple[str, ...] = (".js", ".ts", ".jsx", ".tsx"),
+) -> Iterator[CallSite]:
+    """Yield each usage of a library in a source directory, file by file.
 
-    return True
+    Only one file's call sites are held at a time, so callers that
+    aggregate as they go never hold every CallSite at once. Files are
+    scanned in parallel worker processes once there are enough of them to
+    outweigh the cost of starting the pool.
+
+    Args:
+        source_dir: Directory to search
+        library: Library name to find
+        extensions: File extensions to search
+
+    Yields:
+        CallSite objects, grouped by file
+    """
+    total = 0
+    paths = list(_iter_sources(source_dir, extensions))
+
+    if len(paths) < PARALLEL_MIN_FILES:
+        for file_path in paths:
+            call_sites = _scan_one(file_path, library)
+            total += len(call_sites)
+            yield from call_sites
+    else:
+        logger.info(f"Scanning {len(paths)} files in parallel")
+        with ProcessPoolExecutor() as executor:
+            for call_sites in executor.map(
+                _scan_one, paths, repeat(library), chunksize=32
+            ):
+                total += len(call_sites)
+                yield from call_sites
+
+    logger.info(f"Found {total} total call sites for {library}")
 
 
 def detect_usage(
@@ -198,6 +318,8 @@ def detect_usage(
 ) -> list[CallSite]:
     """Detect all usage of a library in a source directory.
 
+    Collects iter_usage into a list.
+
     Args:
         source_dir: Directory to search
         library: Library name to find
@@ -206,22 +328,4 @@ def detect_usage(
     Returns:
         List of CallSite objects
     """
-    all_call_sites = []
-
-    for file_path in source_dir.rglob("*"):
-        if file_path.suffix not in extensions:
-            continue
-        if "node_modules" in str(file_path):
-            continue
-
-        try:
-            content = file_path.read_text()
-            imports = find_imports(content, library)
-            if imports:
-                call_sites = find_call_sites(content, imports, str(file_path))
-                all_call_sites.extend(call_sites)
-        except Exception as e:
-            logger.warning(f"Failed to parse {file_path}: {e}")
-
-    logger.info(f"Found {len(all_call_sites)} total call sites for {library}")
-    return all_call_sites
+    return list(iter_usage(source_dir, library, extensions))
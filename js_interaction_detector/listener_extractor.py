@@ -1,14 +1,35 @@
 """Extract event listeners from page elements."""
 
+import asyncio
 import logging
+import re
 from dataclasses import dataclass
 
-from playwright.async_api import Page
+from playwright.async_api import CDPSession, Page
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on elements whose listeners are looked up at once
+MAX_CONCURRENT_LOOKUPS = 16
 
-@dataclass
+# addEventListener('type' / addEventListener("type"; group 2 is the event type
+ADD_LISTENER_PATTERN = re.compile(r"""addEventListener\(\s*(['"])([^'"\n]+)\1""")
+
+# A brace, or a regex literal, comment or string literal to skip over whole
+# when matching braces in a function body. A slash starts a regex literal
+# where an operand is expected: after an opening bracket, an operator,
+# ";" or "return" (elsewhere it is division). Character classes are matched
+# separately so a "/" or quote inside [...] doesn't end or open anything
+BODY_TOKEN_PATTERN = re.compile(
+    r"""[{}]"""
+    r"""|(?:(?<=[(,=:\[!&|?{};>])|(?<=\breturn))\s*/(?![/*])"""
+    r"""(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*"""
+    r"""|//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`""",
+    re.DOTALL,
+)
+
+
+@dataclass(slots=True)
 class ListenerInfo:
     """Information about an element's event listeners."""
 
@@ -27,25 +48,207 @@ class ListenerInfo:
             self.attributes = {}
 
 
-async def extract_listeners(page: Page) -> list[ListenerInfo]:
+# Describe every element matching a selector; run via page.evaluate
+_ELEMENT_INFO_JS = """
+    (sel) => Array.from(document.querySelectorAll(sel), (el) => ({
+        tag: el.tagName.toLowerCase(),
+        inputType: el.type || null,
+        name: el.name || null,
+        id: el.id || null,
+        placeholder: el.placeholder || null,
+        attributes: Object.fromEntries(
+            Array.from(el.attributes)
+                .filter(a => !['id', 'name', 'type', 'placeholder', 'class'].includes(a.name))
+                .map(a => [a.name, a.value])
+        )
+    }))
+"""
+
+
+# A script's source, plus the offsets of the lines that register a listener
+# for each event type: {"input": [512, 1780], ...}
+ScriptIndex = tuple[str, dict[str, list[int]]]
+
+
+def _index_listeners(script_source: str) -> ScriptIndex:
+    """Index a script's addEventListener calls in one pass over its source."""
+    index: dict[str, list[int]] = {}
+    for match in ADD_LISTENER_PATTERN.finditer(script_source):
+        line_start = script_source.rfind("\n", 0, match.start()) + 1
+        line_starts = index.setdefault(match.group(2), [])
+        if not line_starts or line_starts[-1] != line_start:
+            line_starts.append(line_start)
+    return script_source, index
+
+
+async def _fetch_script_index(client: CDPSession, script_id: str) -> ScriptIndex:
+    """Fetch a script's source over CDP and index it."""
+    response = await client.send("Debugger.getScriptSource", {"scriptId": script_id})
+    return _index_listeners(response.get("scriptSource", ""))
+
+
+def _script_index(
+    client: CDPSession,
+    script_id: str,
+    script_cache: dict[str, asyncio.Future[ScriptIndex]],
+) -> asyncio.Future[ScriptIndex]:
+    """Get a script's index, fetching each script at most once per page.
+
+    The cache holds futures rather than results so that concurrent lookups
+    of the same script share a single in-flight request.
+    """
+    script_index = script_cache.get(script_id)
+    if script_index is None:
+        script_index = asyncio.ensure_future(_fetch_script_index(client, script_id))
+        script_cache[script_id] = script_index
+    return script_index
+
+
+def _function_code_from(source: str, start: int) -> str:
+    """Extract the brace-delimited function body starting at a given offset.
+
+    The body runs from the line holding the first opening brace (at or
+    after ``start``) to the end of the line where the braces balance.
+    Braces inside strings, comments and regex literals are ignored. Returns
+    an empty string if no opening brace follows.
+    """
+    body_start = None
+    depth = 0
+
+    for token in BODY_TOKEN_PATTERN.finditer(source, start):
+        brace = token.group()
+        if brace == "{":
+            if body_start is None:
+                body_start = source.rfind("\n", 0, token.start()) + 1
+            depth += 1
+        elif brace == "}" and body_start is not None:
+            depth -= 1
+            if depth == 0:
+                line_end = source.find("\n", token.end())
+                return source[body_start : None if line_end == -1 else line_end]
+
+    return "" if body_start is None else source[body_start:]
+
+
+async def _extract_element_listeners(
+    client: CDPSession,
+    info: dict,
+    script_cache: dict[str, asyncio.Future[ScriptIndex]],
+) -> ListenerInfo | None:
+    """Look up one element's listeners over CDP and extract their code.
+
+    Args:
+        client: CDP session for the element's page, with Debugger enabled
+        info: Element description produced by _ELEMENT_INFO_JS
+        script_cache: Scripts already indexed for this page, by scriptId
+
+    Returns:
+        A ListenerInfo, or None if the element has no listeners
+    """
+    # Build selector
+    selector = info["tag"]
+    if info["id"]:
+        selector += f"#{info['id']}"
+    elif info["name"]:
+        selector += f'[name="{info["name"]}"]'
+
+    # Get event listeners via CDP
+    # Use Runtime.evaluate to get the element and its objectId directly
+    try:
+        # Evaluate a script that returns the specific element
+        result = await client.send(
+            "Runtime.evaluate",
+            {
+                "expression": f"document.querySelector('{selector.replace(chr(39), chr(92) + chr(39))}')",
+                "returnByValue": False,
+            },
+        )
+
+        if "result" not in result or "objectId" not in result["result"]:
+            return None
+
+        object_id = result["result"]["objectId"]
+
+        listeners_response = await client.send(
+            "DOMDebugger.getEventListeners", {"objectId": object_id}
+        )
+    except Exception as e:
+        logger.debug(f"Could not get listeners via CDP for {selector}: {e}")
+        return None
+
+    listeners = listeners_response.get("listeners", [])
+    if not listeners:
+        return None
+
+    # Extract event types and code
+    events = []
+    code_parts = []
+    for listener in listeners:
+        event_type = listener.get("type", "")
+        if event_type:
+            events.append(event_type)
+
+        # Get the script source using scriptId
+        script_id = listener.get("scriptId")
+
+        if script_id:
+            try:
+                # Get the script and where each event type is listened for
+                source, index = await _script_index(client, script_id, script_cache)
+
+                # The line_number from CDP is relative to the entire HTML document
+                # but the script_source only contains the script content, so
+                # match the listener to an addEventListener call by event type
+                for line_start in index.get(event_type, ()):
+                    function_code = _function_code_from(source, line_start)
+                    if function_code:
+                        code_parts.append(function_code)
+                        break  # Found this listener, stop searching
+            except Exception as e:
+                logger.debug(f"Could not extract code from script {script_id}: {e}")
+
+    if not events:
+        return None
+
+    logger.info(f"Found listeners on {selector}: {events}")
+    return ListenerInfo(
+        selector=selector,
+        tag=info["tag"],
+        events=list(set(events)),  # dedupe
+        code="\n\n".join(code_parts) if code_parts else "[code not extractable]",
+        input_type=info["inputType"],
+        name=info["name"],
+        id=info["id"],
+        placeholder=info["placeholder"],
+        attributes=info["attributes"],
+    )
+
+
+async def extract_listeners(
+    page: Page, client: CDPSession | None = None
+) -> list[ListenerInfo]:
     """Extract event listeners from all input elements on the page.
 
     Uses Chrome DevTools Protocol to access getEventListeners.
 
     Args:
         page: A loaded Playwright Page object
+        client: An already-attached CDP session for the page to reuse and
+            share with other CDP consumers. If omitted, a session is opened
+            for this call and detached afterwards.
 
     Returns:
         List of ListenerInfo objects for elements with event listeners
     """
     logger.info("Extracting event listeners from page")
 
-    # Get all input elements
+    # Gather every input element's info in a single round-trip
     input_selectors = 'input, textarea, select, [contenteditable="true"]'
-    elements = await page.query_selector_all(input_selectors)
+    infos = await page.evaluate(_ELEMENT_INFO_JS, input_selectors)
 
-    results = []
-    client = await page.context.new_cdp_session(page)
+    owns_client = client is None
+    if owns_client:
+        client = await page.context.new_cdp_session(page)
 
     # Enable Debugger to access script sources
     try:
@@ -53,150 +256,26 @@ async def extract_listeners(page: Page) -> list[ListenerInfo]:
     except Exception as e:
         logger.warning(f"Could not enable Debugger: {e}")
 
-    for element in elements:
-        try:
-            # Get element info
-            info = await element.evaluate("""
-                (el) => ({
-                    tag: el.tagName.toLowerCase(),
-                    inputType: el.type || null,
-                    name: el.name || null,
-                    id: el.id || null,
-                    placeholder: el.placeholder || null,
-                    attributes: Object.fromEntries(
-                        Array.from(el.attributes)
-                            .filter(a => !['id', 'name', 'type', 'placeholder', 'class'].includes(a.name))
-                            .map(a => [a.name, a.value])
-                    )
-                })
-            """)
-
-            # Build selector
-            selector = info["tag"]
-            if info["id"]:
-                selector += f"#{info['id']}"
-            elif info["name"]:
-                selector += f'[name="{info["name"]}"]'
-
-            # Get event listeners via CDP
-            # Use Runtime.evaluate to get the element and its objectId directly
-            try:
-                # Evaluate a script that returns the specific element
-                result = await client.send(
-                    "Runtime.evaluate",
-                    {
-                        "expression": f"document.querySelector('{selector.replace(chr(39), chr(92) + chr(39))}')",
-                        "returnByValue": False,
-                    },
-                )
-
-                if "result" not in result or "objectId" not in result["result"]:
-                    continue
-
-                object_id = result["result"]["objectId"]
-
-                listeners_response = await client.send(
-                    "DOMDebugger.getEventListeners", {"objectId": object_id}
-                )
-            except Exception as e:
-                logger.debug(f"Could not get listeners via CDP for {selector}: {e}")
-                continue
-
-            listeners = listeners_response.get("listeners", [])
-            if not listeners:
-                continue
-
-            # Extract event types and code
-            events = []
-            code_parts = []
-            for listener in listeners:
-                event_type = listener.get("type", "")
-                if event_type:
-                    events.append(event_type)
-
-                # Get the script source using scriptId
-                script_id = listener.get("scriptId")
-
-                if script_id:
-                    try:
-                        # Get the full script source
-                        script_response = await client.send(
-                            "Debugger.getScriptSource", {"scriptId": script_id}
-                        )
-                        script_source = script_response.get("scriptSource", "")
-
-                        if script_source:
-                            # The lineNumber from CDP is relative to the start of the HTML document
-                            # We need to adjust it to be relative to the script
-                            # Find where the script tag starts in the HTML
-                            lines = script_source.split("\n")
-
-                            # The line_number from CDP is relative to the entire HTML document
-                            # but the script_source only contains the script content
-                            # We need to find the line in the script that contains 'addEventListener'
-                            # and matches our event type
-
-                            # Simple approach: find all addEventListener calls in the script
-                            # and match by event type
-                            for script_line_idx, line in enumerate(lines):
-                                if (
-                                    f"addEventListener('{event_type}'" in line
-                                    or f'addEventListener("{event_type}"' in line
-                                ):
-                                    # Found the addEventListener line, now extract the function body
-                                    function_code = []
-                                    brace_count = 0
-                                    in_function = False
-
-                                    for i in range(script_line_idx, len(lines)):
-                                        curr_line = lines[i]
-                                        if not in_function:
-                                            if "{" in curr_line:
-                                                in_function = True
-                                                brace_count = curr_line.count(
-                                                    "{"
-                                                ) - curr_line.count("}")
-                                                function_code.append(curr_line)
-                                                if brace_count == 0:
-                                                    break
-                                        else:
-                                            function_code.append(curr_line)
-                                            brace_count += curr_line.count(
-                                                "{"
-                                            ) - curr_line.count("}")
-                                            if brace_count == 0:
-                                                break
-
-                                    if function_code:
-                                        code_parts.append("\n".join(function_code))
-                                        break  # Found this listener, stop searching
-                    except Exception as e:
-                        logger.debug(
-                            f"Could not extract code from script {script_id}: {e}"
-                        )
-
-            if events:
-                results.append(
-                    ListenerInfo(
-                        selector=selector,
-                        tag=info["tag"],
-                        events=list(set(events)),  # dedupe
-                        code="\n\n".join(code_parts)
-                        if code_parts
-                        else "[code not extractable]",
-                        input_type=info["inputType"],
-                        name=info["name"],
-                        id=info["id"],
-                        placeholder=info["placeholder"],
-                        attributes=info["attributes"],
-                    )
-                )
-                logger.info(f"Found listeners on {selector}: {events}")
-
-        except Exception as e:
-            logger.warning(f"Error extracting listeners from element: {e}")
-            continue
-
-    await client.detach()
+    # CDP multiplexes requests over one session, so elements can be looked
+    # up concurrently; the semaphore keeps huge pages from flooding it
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+    script_cache: dict[str, asyncio.Future[ScriptIndex]] = {}
+
+    async def extract_one(info: dict) -> ListenerInfo | None:
+        async with semaphore:
+            return await _extract_element_listeners(client, info, script_cache)
+
+    gathered = await asyncio.gather(
+        *(extract_one(info) for info in infos), return_exceptions=True
+    )
+    results = []
+    for outcome in gathered:
+        if isinstance(outcome, Exception):
+            logger.warning(f"Error extracting listeners from element: {outcome}")
+        elif outcome is not None:
+            results.append(outcome)
+
+    if owns_client:
+        await client.detach()
     logger.info(f"Extracted {len(results)} elements with event listeners")
     return results
@@ -1,10 +1,16 @@
 """Data models for analysis output."""
 
 import json
-from dataclasses import asdict, dataclass, field
+import re
+from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class ElementInfo:
     """Information about a DOM element."""
 
@@ -17,7 +23,7 @@ class ElementInfo:
     attributes: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationInfo:
     """Information about a validation rule."""
 
@@ -27,7 +33,7 @@ class ValidationInfo:
     confidence: str | None = None  # "high", "medium", "low"
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorDisplay:
     """Information about how validation errors are displayed."""
 
@@ -36,7 +42,7 @@ class ErrorDisplay:
     sample_message: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Interaction:
     """A detected JavaScript interaction on an element."""
 
@@ -47,7 +53,7 @@ class Interaction:
     examples: dict[str, list[str]] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisError:
     """A non-fatal error encountered during analysis."""
 
@@ -56,7 +62,115 @@ class AnalysisError:
     phase: str  # "loading", "discovery", "extraction"
 
 
-@dataclass
+# Any character outside ASCII; in encoded JSON these only occur in strings
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: re.Match[str]) -> str:
+    """Escape one character the way json.dumps(ensure_ascii=True) does."""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        high, low = 0xD800 | code >> 10, 0xDC00 | code & 0x3FF
+        return f"\\u{high:04x}\\u{low:04x}"
+    return f"\\u{code:04x}"
+
+
+def _dumps(data: dict, indent: int | None) -> str:
+    """Encode a dict as JSON, using orjson when available.
+
+    Output is pure ASCII, with other characters \\u-escaped as by the
+    stdlib's default, so printing it can't fail on consoles with a narrow
+    encoding (e.g. cp1252 on Windows). orjson only writes UTF-8 and only
+    supports 2-space indentation, so its output is escaped afterwards and
+    other indent values go through the stdlib encoder. Without indent,
+    separators are compact, as orjson writes them.
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        text = orjson.dumps(data, option=option).decode()
+        return text if text.isascii() else _NON_ASCII_RE.sub(_escape_non_ascii, text)
+    separators = (",", ":") if indent is None else None
+    return json.dumps(data, indent=indent, separators=separators)
+
+
+def _element_to_dict(element: ElementInfo) -> dict:
+    """Convert an element to a dictionary, keeping None values."""
+    return {
+        "selector": element.selector,
+        "tag": element.tag,
+        "type": element.type,
+        "name": element.name,
+        "id": element.id,
+        "placeholder": element.placeholder,
+        "attributes": dict(element.attributes),
+    }
+
+
+def _error_to_dict(error: AnalysisError) -> dict:
+    """Convert an analysis error to a dictionary."""
+    return {"element": error.element, "error": error.error, "phase": error.phase}
+
+
+def _interaction_to_dict(interaction: Interaction) -> dict:
+    """Convert an interaction to a dictionary, excluding None values.
+
+    Dicts are built field by field rather than with dataclasses.asdict,
+    which recursively deep-copies every value.
+    """
+    validation = interaction.validation
+    result = {
+        "element": _element_to_dict(interaction.element),
+        "triggers": interaction.triggers,
+        "validation": {
+            k: v
+            for k, v in (
+                ("type", validation.type),
+                ("raw_code", validation.raw_code),
+                ("rule_description", validation.rule_description),
+                ("confidence", validation.confidence),
+            )
+            if v is not None
+        },
+    }
+    error_display = interaction.error_display
+    if error_display:
+        result["error_display"] = {
+            k: v
+            for k, v in (
+                ("method", error_display.method),
+                ("selector", error_display.selector),
+                ("sample_message", error_display.sample_message),
+            )
+            if v is not None
+        }
+    if interaction.examples:
+        result["examples"] = interaction.examples
+    return result
+
+
+def to_ndjson_line(url: str, item: Interaction | AnalysisError) -> str:
+    """Serialize one streamed analysis item as a single NDJSON line.
+
+    The line is an object with the page ``url`` and either an
+    ``interaction`` or an ``error`` key, shaped like the entries of
+    AnalysisResult.to_json(). No trailing newline is included.
+
+    Args:
+        url: The page the item was found on
+        item: An Interaction or AnalysisError from the analysis stream
+
+    Returns:
+        Compact JSON text for the item
+    """
+    if isinstance(item, Interaction):
+        data = {"url": url, "interaction": _interaction_to_dict(item)}
+    else:
+        data = {"url": url, "error": _error_to_dict(item)}
+    return _dumps(data, indent=None)
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Complete result of analyzing a page."""
 
@@ -70,31 +184,17 @@ class AnalysisResult:
         return {
             "url": self.url,
             "analyzed_at": self.analyzed_at,
-            "errors": [asdict(e) for e in self.errors],
-            "interactions": [self._interaction_to_dict(i) for i in self.interactions],
+            "errors": [_error_to_dict(e) for e in self.errors],
+            "interactions": [_interaction_to_dict(i) for i in self.interactions],
         }
 
-    def _interaction_to_dict(self, interaction: Interaction) -> dict:
-        """Convert an interaction to a dictionary, excluding None values."""
-        result = {
-            "element": asdict(interaction.element),
-            "triggers": interaction.triggers,
-            "validation": asdict(interaction.validation),
-        }
-        # Remove None values from nested dicts
-        result["validation"] = {
-            k: v for k, v in result["validation"].items() if v is not None
-        }
-        if interaction.error_display:
-            result["error_display"] = {
-                k: v
-                for k, v in asdict(interaction.error_display).items()
-                if v is not None
-            }
-        if interaction.examples:
-            result["examples"] = interaction.examples
-        return result
-
-    def to_json(self, indent: int = 2) -> str:
-        """Serialize to JSON string."""
-        return json.dumps(self.to_dict(), indent=indent)
+    def to_json(self, indent: int | None = 2) -> str:
+        """Serialize to JSON string.
+
+        Uses orjson when available, which is much faster on results with
+        many interactions.
+
+        Args:
+            indent: Spaces to indent by, or None for a single compact line
+        """
+        return _dumps(self.to_dict(), indent)
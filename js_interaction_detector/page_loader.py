@@ -1,13 +1,33 @@
 """Load web pages using Playwright."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
 
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
 from playwright.async_api import Error as PlaywrightError
-from playwright.async_api import Page, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 logger = logging.getLogger(__name__)
 
+# How pages are considered loaded:
+#   "fast"   - DOMContentLoaded, then up to LOAD_SETTLE_TIMEOUT_MS for "load"
+#   "strict" - network idle (no requests for 500 ms), which never settles on
+#              pages that long-poll or send beacons
+WAIT_STRATEGIES = ("fast", "strict")
+LOAD_SETTLE_TIMEOUT_MS = 3000
+
 
 class PageLoadError(Exception):
     """Error loading a page."""
@@ -17,8 +37,202 @@ class PageLoadError(Exception):
         self.phase = phase
 
 
+def validate_wait_strategy(wait_strategy: str) -> None:
+    """Raise ValueError unless wait_strategy is one of WAIT_STRATEGIES."""
+    if wait_strategy not in WAIT_STRATEGIES:
+        raise ValueError(f"Unknown wait strategy: {wait_strategy}")
+
+
+def _validate_url(url: str) -> None:
+    """Raise PageLoadError unless the URL uses a supported scheme."""
+    parsed = urlparse(url)
+    if not parsed.scheme or parsed.scheme not in ("http", "https", "file"):
+        logger.error(f"Invalid URL scheme: {url}")
+        raise PageLoadError(f"Invalid URL: {url}")
+
+
+async def _goto(page: Page, url: str, wait_strategy: str = "fast") -> Page:
+    """Navigate an already-open page and wait for it to load.
+
+    Closes the page and raises PageLoadError if navigation fails.
+    """
+    try:
+        logger.info(f"Loading page: {url}")
+        if wait_strategy == "strict":
+            await page.goto(url, wait_until="networkidle")
+        else:
+            await page.goto(url, wait_until="domcontentloaded")
+            try:
+                await page.wait_for_load_state("load", timeout=LOAD_SETTLE_TIMEOUT_MS)
+            except PlaywrightTimeoutError:
+                logger.debug(f"Page still loading, continuing anyway: {url}")
+        logger.info(f"Page loaded successfully: {url}")
+        return page
+    except PlaywrightError as e:
+        await page.close()
+        logger.error(f"Failed to load page: {e}")
+        raise PageLoadError(str(e), phase="loading") from e
+
+
+async def open_page(
+    context: BrowserContext, url: str, wait_strategy: str = "fast"
+) -> Page:
+    """Open a new page in the given context and load a URL into it.
+
+    Args:
+        context: The BrowserContext to open the page in
+        url: The URL to load (http, https, or file://)
+        wait_strategy: "fast" or "strict" (see WAIT_STRATEGIES)
+
+    Returns:
+        The loaded Playwright Page object
+
+    Raises:
+        PageLoadError: If the URL is invalid or page fails to load
+        ValueError: If wait_strategy is unknown
+    """
+    validate_wait_strategy(wait_strategy)
+    _validate_url(url)
+    page = await context.new_page()
+    return await _goto(page, url, wait_strategy)
+
+
+class BrowserPool:
+    """Launch Chromium once and lend out fresh BrowserContexts from it.
+
+    Launching a browser costs hundreds of milliseconds, while a context is
+    cheap. The pool shares one browser across borrowers and gives each
+    borrow a new context, closed again on release, so no state (storage,
+    service workers, permissions, ...) leaks from one analysis into the
+    next. At most ``max_contexts`` contexts are open at once.
+
+    Usage:
+        async with BrowserPool() as pool:
+            async with pool.context() as context:
+                page = await open_page(context, url)
+                ...
+    """
+
+    def __init__(self, max_contexts: int = 8):
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._lock = asyncio.Lock()
+        self._max_contexts = max_contexts
+        self._context_count = 0
+        # Notified whenever a context slot frees up
+        self._available = asyncio.Condition()
+
+    async def __aenter__(self) -> BrowserPool:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.shutdown()
+
+    async def start(self) -> None:
+        """Launch the shared browser if it is not already running."""
+        async with self._lock:
+            if self._browser is not None:
+                return
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch()
+            except Exception:
+                # Don't leave a driver running; the next caller retries cleanly
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            logger.info("Browser pool launched")
+
+    async def acquire_context(self) -> BrowserContext:
+        """Borrow a new BrowserContext in the shared browser.
+
+        Waits while ``max_contexts`` contexts are already borrowed. The
+        caller must hand the context back with release_context (or use the
+        context() manager).
+        """
+        await self.start()
+        async with self._available:
+            while self._context_count >= self._max_contexts:
+                await self._available.wait()
+            # Claim the slot before creating the context outside the lock
+            self._context_count += 1
+
+        try:
+            context = await self._browser.new_context()
+        except Exception:
+            await self._free_slot()
+            raise
+        logger.debug("Browser context created")
+        return context
+
+    async def _free_slot(self) -> None:
+        """Give up a context slot and wake a borrower waiting for one."""
+        async with self._available:
+            self._context_count -= 1
+            self._available.notify()
+
+    async def release_context(self, context: BrowserContext) -> None:
+        """Close a borrowed context and free its slot."""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Could not close browser context: {e}")
+        finally:
+            await self._free_slot()
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Borrow a context for the duration of an ``async with`` block."""
+        context = await self.acquire_context()
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    async def shutdown(self) -> None:
+        """Close the shared browser (and its contexts) and stop Playwright."""
+        async with self._lock:
+            if self._browser:
+                await self._browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+            self._context_count = 0
+        logger.info("Browser pool shut down")
+
+
+# One default pool per event loop: a browser launched under one loop cannot
+# be driven from another (e.g. successive asyncio.run() calls).
+_default_pools: WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool] = (
+    WeakKeyDictionary()
+)
+
+
+def get_default_pool() -> BrowserPool:
+    """Get the shared BrowserPool for the running event loop.
+
+    The pool launches its browser lazily on first use.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _default_pools.get(loop)
+    if pool is None:
+        pool = BrowserPool()
+        _default_pools[loop] = pool
+        logger.info("Created default browser pool")
+    return pool
+
+
+async def shutdown_default_pool() -> None:
+    """Shut down the default BrowserPool for the running event loop, if any."""
+    pool = _default_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.shutdown()
+
+
 class PageLoader:
-    """Load pages using Playwright with network idle wait."""
+    """Load pages using Playwright."""
 
     def __init__(self):
         self._playwright = None
@@ -44,31 +258,21 @@ class PageLoader:
             await self._playwright.stop()
         logger.info("Browser closed")
 
-    async def load(self, url: str) -> Page:
-        """Load a page and wait for network idle.
+    async def load(self, url: str, wait_strategy: str = "fast") -> Page:
+        """Load a page and wait for it to settle.
 
         Args:
             url: The URL to load (http, https, or file://)
+            wait_strategy: "fast" or "strict" (see WAIT_STRATEGIES)
 
         Returns:
             The loaded Playwright Page object
 
         Raises:
             PageLoadError: If the URL is invalid or page fails to load
+            ValueError: If wait_strategy is unknown
         """
-        # Validate URL
-        parsed = urlparse(url)
-        if not parsed.scheme or parsed.scheme not in ("http", "https", "file"):
-            logger.error(f"Invalid URL scheme: {url}")
-            raise PageLoadError(f"Invalid URL: {url}")
-
+        validate_wait_strategy(wait_strategy)
+        _validate_url(url)
         page = await self._browser.new_page()
-        try:
-            logger.info(f"Loading page: {url}")
-            await page.goto(url, wait_until="networkidle")
-            logger.info(f"Page loaded successfully: {url}")
-            return page
-        except PlaywrightError as e:
-            await page.close()
-            logger.error(f"Failed to load page: {e}")
-            raise PageLoadError(str(e), phase="loading") from e
+        return await _goto(page, url, wait_strategy)
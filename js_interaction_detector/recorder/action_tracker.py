@@ -1,6 +1,8 @@
 """Track user actions (clicks and input) via injected JavaScript."""
 
+import asyncio
 import logging
+from collections.abc import Callable
 from typing import Any
 
 from playwright.async_api import Page
@@ -9,210 +11,424 @@ from .selector_generator import generate_selector
 
 logger = logging.getLogger(__name__)
 
+# Converting at least this many actions is worth a hop to a worker thread
+THREAD_MIN_ACTIONS = 500
+
+
+def _convert_actions(raw_actions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert raw actions from the page into action dicts with selectors."""
+    actions = []
+    for raw_action in raw_actions:
+        element_info = raw_action["elementInfo"]
+        # The page reports classes as one space-separated string
+        selector, is_fragile = generate_selector(
+            {**element_info, "classes": element_info.get("classes", "").split()}
+        )
+
+        action = {
+            "type": raw_action["type"],
+            "selector": selector,
+            "is_fragile": is_fragile,
+        }
+
+        # Add value for fill actions
+        if raw_action["type"] == "fill":
+            action["value"] = raw_action.get("value", "")
+
+        actions.append(action)
+
+    return actions
+
+
+# Defines window.__actionTrackerInstall, which injects the click and input
+# listeners. Registered as an init script, so every document the page
+# navigates to already has it compiled and start() only has to call it
+_INSTALL_TRACKER_JS = """
+    window.__actionTrackerInstall = () => {
+        // The init script also runs in every iframe, and actions there
+        // would be recorded with selectors the test resolves against the
+        // top document
+        if (window !== window.top) {
+            return;
+        }
+
+        // Describe an element for selector generation. Actions hold
+        // the element itself and are only described when fetched, so
+        // events that get debounced away never pay for this
+        function snapshot(el, timestamp) {
+            return {
+                tag: el.tagName.toLowerCase(),
+                id: el.id || '',
+                // Space-separated; split on the Python side
+                classes: el.getAttribute('class') || '',
+                'data-testid': el.getAttribute('data-testid') || '',
+                'aria-label': el.getAttribute('aria-label') || '',
+                timestamp: timestamp
+            };
+        }
+
+        // Identity of each element across reads, so Python can debounce
+        // actions on the same element without relying on its selector
+        // (two inputs can share one). Kept on window so reinstalling in
+        // the same document keeps the keys, and prefixed with the
+        // document's time origin so keys never repeat across documents
+        if (!window.__actionTrackerKeys) {
+            window.__actionTrackerKeys = {byElement: new WeakMap(), next: 0};
+        }
+        const elementKeys = window.__actionTrackerKeys;
+        function keyFor(el) {
+            let key = elementKeys.byElement.get(el);
+            if (key === undefined) {
+                key = performance.timeOrigin + ':' + elementKeys.next++;
+                elementKeys.byElement.set(el, key);
+            }
+            return key;
+        }
+
+        // Empty the buffer, along with the bookkeeping that points
+        // into it
+        function reset() {
+            window.__actionTracker.actions = [];
+            lastInputClickIndex = new WeakMap();
+            inputDebounceMap = new WeakMap();
+            lastFill = {element: null, action: null};
+        }
+
+        // Hand the live (not debounced-away) actions to Python and
+        // empty the buffer, so the page only holds actions recorded
+        // since the last read. Python merges fills and focusing
+        // clicks across reads
+        function take() {
+            flushInputs();
+            const taken = window.__actionTracker.actions
+                .filter(a => a !== null)
+                .map(a => ({
+                    type: a.type,
+                    value: a.value,
+                    inputClick: a.inputClick || false,
+                    elementKey: keyFor(a.el),
+                    elementInfo: snapshot(a.el, a.timestamp)
+                }));
+            reset();
+            return taken;
+        }
+
+        // Create storage for actions
+        window.__actionTracker = {
+            actions: [],
+            take: take,
+            reset: reset
+        };
+
+        // Tell the Python side an action was recorded, if it asked
+        function notifyAction() {
+            if (window.__actionTrackerNotify) {
+                window.__actionTrackerNotify();
+            }
+        }
+
+        const INPUT_TAGS = new Set(['INPUT', 'TEXTAREA', 'SELECT']);
+        const TEXTBOX_ROLES = new Set(['textbox', 'searchbox']);
+
+        // Whether a custom element's shadow DOM contains an input. The
+        // querySelector result is cached per element and dropped when the
+        // shadow contents change, so hot ancestor walks skip the query
+        const shadowInputCache = new WeakMap();
+        const observedShadowRoots = new WeakSet();
+        function hasShadowInput(el) {
+            const root = el.shadowRoot;
+            if (!root) {
+                return false;
+            }
+            let found = shadowInputCache.get(el);
+            if (found === undefined) {
+                found = root.querySelector('input, textarea') !== null;
+                shadowInputCache.set(el, found);
+                if (!observedShadowRoots.has(root)) {
+                    observedShadowRoots.add(root);
+                    new MutationObserver(() => shadowInputCache.delete(el))
+                        .observe(root, {childList: true, subtree: true});
+                }
+            }
+            return found;
+        }
+
+        // Helper to check if element is an input-like element
+        function isInputElement(el) {
+            if (INPUT_TAGS.has(el.tagName)) {
+                return true;
+            }
+            if (el.isContentEditable) {
+                return true;
+            }
+            if (TEXTBOX_ROLES.has(el.getAttribute('role'))) {
+                return true;
+            }
+            // Check for custom elements with shadow DOM inputs
+            return hasShadowInput(el);
+        }
+
+        // Track last click on input elements for potential removal.
+        // Bookkeeping is keyed on the elements themselves, weakly, so
+        // entries for removed or re-rendered nodes get collected
+        let lastInputClickIndex = new WeakMap();
+
+        // Prevent form submissions to avoid page navigation. Only this
+        // listener cancels events, so only it can't be passive
+        document.addEventListener('click', (event) => {
+            const element = event.target;
+            if (element.tagName === 'BUTTON' && element.type === 'submit') {
+                event.preventDefault();
+            }
+        }, true);  // Use capture phase
+
+        // Track clicks
+        function handleClick(event) {
+            const element = event.target;
+            flushInputs();
+
+            const actionIndex = window.__actionTracker.actions.length;
+            const inputClick = isInputElement(element);
+            window.__actionTracker.actions.push({
+                type: 'click',
+                el: element,
+                timestamp: Date.now(),
+                inputClick: inputClick
+            });
+
+            // If this is an input element, track it for potential removal
+            // when a fill action follows
+            if (inputClick) {
+                lastInputClickIndex.set(element, actionIndex);
+            }
+            notifyAction();
+        }
+
+        // Track input events (debounced)
+        let inputDebounceMap = new WeakMap();
+        // The most recent fill action and its element
+        let lastFill = {element: null, action: null};
+
+        // Helper to find input value from element or its shadow DOM
+        function getInputValue(element) {
+            // Standard input elements
+            if (element.value !== undefined) {
+                return element.value;
+            }
+            // Contenteditable elements
+            if (element.isContentEditable) {
+                return element.textContent || '';
+            }
+            // Try shadow DOM - look for input inside
+            if (element.shadowRoot) {
+                const shadowInput = element.shadowRoot.querySelector('input, textarea');
+                if (shadowInput) {
+                    return shadowInput.value || '';
+                }
+            }
+            return null;
+        }
+
+        // Helper to find the best element to use for selector
+        function findInputElement(target) {
+            // If it's a standard input, use it
+            if (INPUT_TAGS.has(target.tagName)) {
+                return target;
+            }
+            // If contenteditable, use it
+            if (target.isContentEditable) {
+                return target;
+            }
+            // Look for parent with role="textbox" or similar
+            let current = target;
+            while (current && current !== document.body) {
+                if (TEXTBOX_ROLES.has(current.getAttribute('role')) ||
+                    current.isContentEditable) {
+                    return current;
+                }
+                // Check for custom element with shadow DOM containing input
+                if (hasShadowInput(current)) {
+                    return current;  // Return the custom element, not shadow input
+                }
+                current = current.parentElement;
+            }
+            return null;
+        }
+
+        // A target always resolves to the same input element, so
+        // walk the DOM once per target rather than once per keystroke
+        const inputElementCache = new WeakMap();
+        function inputElementFor(target) {
+            let element = inputElementCache.get(target);
+            if (element === undefined) {
+                element = findInputElement(target);
+                if (element) {
+                    inputElementCache.set(target, element);
+                }
+            }
+            return element;
+        }
+
+        // Key repeat fires input far faster than anyone reads it, so
+        // queue the latest target per element and record them together
+        // once the page is idle
+        let pendingInputs = new Map();
+        let flushScheduled = false;
+
+        function handleInput(event) {
+            const target = event.target;
+            const element = inputElementFor(target);
+
+            if (!element) {
+                return;
+            }
+
+            pendingInputs.set(element, target);
+            if (!flushScheduled) {
+                flushScheduled = true;
+                if (window.requestIdleCallback) {
+                    requestIdleCallback(flushInputs, {timeout: 50});
+                } else {
+                    setTimeout(flushInputs, 16);
+                }
+            }
+        }
+
+        // Record every queued input. Also called before a click is
+        // recorded and before actions are read, to keep them in order
+        function flushInputs() {
+            flushScheduled = false;
+            const batch = pendingInputs;
+            pendingInputs = new Map();
+            for (const [element, target] of batch) {
+                recordInput(element, target);
+            }
+        }
+
+        function recordInput(element, target) {
+            const value = getInputValue(element) || getInputValue(target);
+            if (value === null) {
+                return;
+            }
+
+            // Typing on in the field that was filled last updates its
+            // fill action in place, so a burst of keystrokes neither
+            // grows the action list nor leaves a trail of nulls
+            const actions = window.__actionTracker.actions;
+            const lastAction = actions[actions.length - 1];
+            if (lastAction && lastAction === lastFill.action &&
+                lastFill.element === element) {
+                lastAction.timestamp = Date.now();
+                lastAction.value = value;
+                notifyAction();
+                return;
+            }
+
+            // Remove the click action that preceded this fill (if any)
+            // This handles "click to focus, then type" as a single fill action
+            if (lastInputClickIndex.has(element)) {
+                const clickIndex = lastInputClickIndex.get(element);
+                window.__actionTracker.actions[clickIndex] = null;
+                lastInputClickIndex.delete(element);
+            }
+
+            // Debounce: remove previous fill action for same element
+            if (inputDebounceMap.has(element)) {
+                const oldIndex = inputDebounceMap.get(element);
+                // Mark as removed
+                window.__actionTracker.actions[oldIndex] = null;
+            }
+
+            // Add new action
+            const newIndex = window.__actionTracker.actions.length;
+            const fillAction = {
+                type: 'fill',
+                el: element,
+                timestamp: Date.now(),
+                value: value
+            };
+            window.__actionTracker.actions.push(fillAction);
+            inputDebounceMap.set(element, newIndex);
+            lastFill = {element: element, action: fillAction};
+            notifyAction();
+        }
+
+        // One passive, capture-phase handler records clicks and input
+        function handleEvent(event) {
+            if (event.type === 'click') {
+                handleClick(event);
+            } else {
+                handleInput(event);
+            }
+        }
+        for (const type of ['click', 'input']) {
+            document.addEventListener(
+                type, handleEvent, {capture: true, passive: true}
+            );
+        }
+    };
+"""
+
 
 class ActionTracker:
     """Track user interactions (clicks and input) on a page."""
 
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, on_action: Callable[[], None] | None = None):
         """Initialize the action tracker.
 
         Args:
             page: The Playwright page to track actions on
+            on_action: Optional callback invoked whenever the page records an
+                action, so callers can react to events instead of polling
         """
         self._page = page
-        self._actions: list[dict[str, Any]] = []
+        # Actions read from the page so far; None marks a removed action
+        self._actions: list[dict[str, Any] | None] = []
+        # Element key (from the page) -> index in _actions of its latest
+        # fill, and of a click that focused an input a fill may still replace
+        self._fill_at: dict[str, int] = {}
+        self._input_click_at: dict[str, int] = {}
+        self._on_action = on_action
+        self._notifier_exposed = False
+        self._install_script_added = False
 
     async def start(self) -> None:
         """Start tracking actions by injecting JavaScript listeners."""
-        # Inject JavaScript to track interactions
-        await self._page.evaluate("""
-            () => {
-                // Create storage for actions
-                window.__actionTracker = {
-                    actions: []
-                };
-
-                // Helper to check if element is an input-like element
-                function isInputElement(el) {
-                    if (['INPUT', 'TEXTAREA', 'SELECT'].includes(el.tagName)) {
-                        return true;
-                    }
-                    if (el.isContentEditable) {
-                        return true;
-                    }
-                    if (el.getAttribute('role') === 'textbox' ||
-                        el.getAttribute('role') === 'searchbox') {
-                        return true;
-                    }
-                    // Check for custom elements with shadow DOM inputs
-                    if (el.shadowRoot) {
-                        const shadowInput = el.shadowRoot.querySelector('input, textarea');
-                        if (shadowInput) {
-                            return true;
-                        }
-                    }
-                    return false;
-                }
-
-                // Track last click on input elements for potential removal
-                let lastInputClickIndex = new Map();
-
-                // Track clicks
-                document.addEventListener('click', (event) => {
-                    const element = event.target;
-
-                    // Prevent form submissions to avoid page navigation
-                    if (element.tagName === 'BUTTON' && element.type === 'submit') {
-                        event.preventDefault();
-                    }
-
-                    // Capture element info
-                    const elementInfo = {
-                        tag: element.tagName.toLowerCase(),
-                        id: element.id || '',
-                        classes: Array.from(element.classList),
-                        'data-testid': element.getAttribute('data-testid') || '',
-                        'aria-label': element.getAttribute('aria-label') || '',
-                        timestamp: Date.now()
-                    };
-
-                    // Create unique key for element
-                    const elementKey = element.id ||
-                                     element.getAttribute('data-testid') ||
-                                     element.getAttribute('name') ||
-                                     JSON.stringify(elementInfo);
-
-                    const actionIndex = window.__actionTracker.actions.length;
-                    window.__actionTracker.actions.push({
-                        type: 'click',
-                        elementInfo: elementInfo
-                    });
-
-                    // If this is an input element, track it for potential removal
-                    // when a fill action follows
-                    if (isInputElement(element)) {
-                        lastInputClickIndex.set(elementKey, actionIndex);
-                    }
-                }, true);  // Use capture phase
-
-                // Track input events (debounced)
-                let inputDebounceMap = new Map();
-
-                // Helper to find input value from element or its shadow DOM
-                function getInputValue(element) {
-                    // Standard input elements
-                    if (element.value !== undefined) {
-                        return element.value;
-                    }
-                    // Contenteditable elements
-                    if (element.isContentEditable) {
-                        return element.textContent || '';
-                    }
-                    // Try shadow DOM - look for input inside
-                    if (element.shadowRoot) {
-                        const shadowInput = element.shadowRoot.querySelector('input, textarea');
-                        if (shadowInput) {
-                            return shadowInput.value || '';
-                        }
-                    }
-                    return null;
-                }
+        # Exposed functions and init scripts survive navigations, so
+        # register them only once
+        if self._on_action is not None and not self._notifier_exposed:
+            await self._page.expose_function("__actionTrackerNotify", self._on_action)
+            self._notifier_exposed = True
+        if not self._install_script_added:
+            await self._page.add_init_script(script=_INSTALL_TRACKER_JS)
+            # Init scripts only run in documents loaded from now on, so run
+            # it here too (wrapped in a function so evaluate doesn't call the
+            # installer it defines)
+            await self._page.evaluate(f"() => {{{_INSTALL_TRACKER_JS}}}")
+            self._install_script_added = True
 
-                // Helper to find the best element to use for selector
-                function findInputElement(target) {
-                    // If it's a standard input, use it
-                    if (['INPUT', 'TEXTAREA', 'SELECT'].includes(target.tagName)) {
-                        return target;
-                    }
-                    // If contenteditable, use it
-                    if (target.isContentEditable) {
-                        return target;
-                    }
-                    // Look for parent with role="textbox" or similar
-                    let current = target;
-                    while (current && current !== document.body) {
-                        if (current.getAttribute('role') === 'textbox' ||
-                            current.getAttribute('role') === 'searchbox' ||
-                            current.isContentEditable) {
-                            return current;
-                        }
-                        // Check for custom element with shadow DOM containing input
-                        if (current.shadowRoot) {
-                            const shadowInput = current.shadowRoot.querySelector('input, textarea');
-                            if (shadowInput) {
-                                return current;  // Return the custom element, not shadow input
-                            }
-                        }
-                        current = current.parentElement;
-                    }
-                    return null;
-                }
-
-                document.addEventListener('input', (event) => {
-                    const target = event.target;
-                    const element = findInputElement(target);
-
-                    if (!element) {
-                        return;
-                    }
-
-                    const value = getInputValue(element) || getInputValue(target);
-                    if (value === null) {
-                        return;
-                    }
-
-                    // Capture element info
-                    const elementInfo = {
-                        tag: element.tagName.toLowerCase(),
-                        id: element.id || '',
-                        classes: Array.from(element.classList),
-                        'data-testid': element.getAttribute('data-testid') || '',
-                        'aria-label': element.getAttribute('aria-label') || '',
-                        timestamp: Date.now()
-                    };
-
-                    // Create unique key for element
-                    const elementKey = element.id ||
-                                     element.getAttribute('data-testid') ||
-                                     element.getAttribute('name') ||
-                                     JSON.stringify(elementInfo);
-
-                    // Remove the click action that preceded this fill (if any)
-                    // This handles "click to focus, then type" as a single fill action
-                    if (lastInputClickIndex.has(elementKey)) {
-                        const clickIndex = lastInputClickIndex.get(elementKey);
-                        window.__actionTracker.actions[clickIndex] = null;
-                        lastInputClickIndex.delete(elementKey);
-                    }
-
-                    // Debounce: remove previous fill action for same element
-                    if (inputDebounceMap.has(elementKey)) {
-                        const oldIndex = inputDebounceMap.get(elementKey);
-                        // Mark as removed
-                        window.__actionTracker.actions[oldIndex] = null;
-                    }
-
-                    // Add new action
-                    const newIndex = window.__actionTracker.actions.length;
-                    window.__actionTracker.actions.push({
-                        type: 'fill',
-                        elementInfo: elementInfo,
-                        value: value
-                    });
-                    inputDebounceMap.set(elementKey, newIndex);
-                }, true);  // Use capture phase
-            }
-        """)
+        # Inject JavaScript to track interactions
+        await self._page.evaluate("() => window.__actionTrackerInstall()")
         logger.info("Action tracking started")
 
-    async def get_actions(self) -> list[dict[str, Any]]:
+    async def get_actions(self, drain: bool = False) -> list[dict[str, Any]]:
         """Get all tracked actions.
 
+        Each call moves the actions recorded since the previous one out of
+        the page, so the page never holds more than one batch.
+
+        Args:
+            drain: Also forget the returned actions, so the next call only
+                returns newer ones (equivalent to get_actions() then clear())
+
         Returns:
             List of action dicts with: type, selector, is_fragile, value (optional)
         """
-        # Fetch actions from browser and process them
-        actions = await self._fetch_and_convert_actions()
+        raw_actions, new_actions = await self._fetch_and_convert_actions()
+        self._merge_actions(raw_actions, new_actions)
+        actions = [action for action in self._actions if action is not None]
+        if drain:
+            self._forget_actions()
         logger.info(f"Retrieved {len(actions)} actions")
         return actions
 
@@ -221,42 +437,67 @@ class ActionTracker:
         await self._page.evaluate("""
             () => {
                 if (window.__actionTracker) {
-                    window.__actionTracker.actions = [];
+                    window.__actionTracker.reset();
                 }
             }
         """)
+        self._forget_actions()
         logger.info("Action tracker cleared")
 
-    async def _fetch_and_convert_actions(self) -> list[dict[str, Any]]:
-        """Async version of syncing actions from browser."""
-        # Fetch raw actions from browser
-        raw_actions = await self._page.evaluate("""
-            () => {
-                if (!window.__actionTracker) {
-                    return [];
-                }
-                // Filter out null entries (debounced items)
-                return window.__actionTracker.actions.filter(a => a !== null);
-            }
-        """)
-
-        # Convert to our format
-        actions = []
-        for raw_action in raw_actions:
-            element_info = raw_action["elementInfo"]
-            selector, is_fragile = generate_selector(element_info)
-
-            action = {
-                "type": raw_action["type"],
-                "selector": selector,
-                "is_fragile": is_fragile,
-            }
-
-            # Add value for fill actions
-            if raw_action["type"] == "fill":
-                action["value"] = raw_action.get("value", "")
+    def _forget_actions(self) -> None:
+        """Drop the actions already read from the page."""
+        self._actions = []
+        self._fill_at = {}
+        self._input_click_at = {}
+
+    def _merge_actions(
+        self, raw_actions: list[dict[str, Any]], new_actions: list[dict[str, Any]]
+    ) -> None:
+        """Append newly read actions, debouncing against earlier reads.
+
+        The page debounces within one read; this applies the same rules
+        across reads, identifying elements by the key the page assigns each
+        one (selectors can be shared by several elements): a fill replaces
+        the click that focused its input and any earlier fill of that input,
+        and a fill that directly follows one on the same input is updated in
+        place.
+        """
+        for raw_action, action in zip(raw_actions, new_actions, strict=True):
+            element_key = raw_action["elementKey"]
+            if action["type"] == "fill":
+                click_at = self._input_click_at.pop(element_key, None)
+                if click_at is not None:
+                    self._actions[click_at] = None
+                fill_at = self._fill_at.get(element_key)
+                if fill_at is not None:
+                    if fill_at == len(self._actions) - 1:
+                        self._actions[fill_at] = action
+                        continue
+                    self._actions[fill_at] = None
+                self._fill_at[element_key] = len(self._actions)
+            elif raw_action.get("inputClick"):
+                self._input_click_at[element_key] = len(self._actions)
+            self._actions.append(action)
+
+    async def _fetch_and_convert_actions(
+        self,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Move new actions out of the page and convert them.
 
-            actions.append(action)
+        Returns:
+            The raw actions as read from the page, and the converted actions
+        """
+        # Fetch raw actions from browser; the work happens in take(),
+        # which was defined once when tracking started
+        raw_actions = await self._page.evaluate(
+            "() => window.__actionTracker ? window.__actionTracker.take() : []"
+        )
+
+        # Convert to our format, off the event loop for big batches
+        if len(raw_actions) >= THREAD_MIN_ACTIONS:
+            actions = await asyncio.to_thread(_convert_actions, raw_actions)
+        else:
+            actions = _convert_actions(raw_actions)
 
         logger.info(f"Synced {len(actions)} actions from browser")
-        return actions
+        return raw_actions, actions
@@ -1,13 +1,16 @@
 """Generate stable CSS selectors for elements."""
 
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
 
 def _escape_selector_value(value: str) -> str:
     """Escape special characters in CSS selector attribute values."""
-    return value.replace("\\", "\\\\").replace('"', '\\"')
+    return value.translate(_ESCAPE_TABLE)
 
 
 def generate_selector(element_info: dict) -> tuple[str, bool]:
@@ -26,47 +29,67 @@ def generate_selector(element_info: dict) -> tuple[str, bool]:
     Returns:
         Tuple of (selector_string, is_fragile)
     """
-    tag = element_info.get("tag", "div")
+    # Filter out empty or whitespace-only class names
+    classes = element_info.get("classes", [])
+    selector, is_fragile, source = _build_selector(
+        element_info.get("tag", "div"),
+        element_info.get("data-testid"),
+        element_info.get("id"),
+        element_info.get("aria-label"),
+        tuple(c.strip() for c in classes if c and c.strip()),
+    )
+
+    # Logged here rather than in the cached builder, so every element that
+    # gets a selector is logged, not just the first with the same fields
+    if source == "tag":
+        logger.warning("Generated very fragile tag-only selector: %s", selector)
+    elif is_fragile:
+        logger.info("Generated fragile selector from classes: %s", selector)
+    else:
+        logger.info("Generated selector from %s: %s", source, selector)
+    return selector, is_fragile
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_selector(
+    tag: str,
+    testid: str | None,
+    elem_id: str | None,
+    aria_label: str | None,
+    classes: tuple[str, ...],
+) -> tuple[str, bool, str]:
+    """generate_selector, memoized on every field it reads.
 
+    Pages often touch the same elements over and over (style toggles,
+    repeated clicks), so each selector is only built once.
+
+    Returns:
+        Tuple of (selector_string, is_fragile, the field it was built from)
+    """
     # Priority 1: data-testid
-    testid = element_info.get("data-testid")
     if testid:
         testid = testid.strip()
         if testid:
             escaped_testid = _escape_selector_value(testid)
-            selector = f'[data-testid="{escaped_testid}"]'
-            logger.info(f"Generated selector from data-testid: {selector}")
-            return selector, False
+            return f'[data-testid="{escaped_testid}"]', False, "data-testid"
 
     # Priority 2: id
-    elem_id = element_info.get("id")
     if elem_id:
         elem_id = elem_id.strip()
         if elem_id:
-            selector = f"#{elem_id}"
-            logger.info(f"Generated selector from id: {selector}")
-            return selector, False
+            return f"#{elem_id}", False, "id"
 
     # Priority 3: aria-label
-    aria_label = element_info.get("aria-label")
     if aria_label:
         aria_label = aria_label.strip()
         if aria_label:
             escaped_aria_label = _escape_selector_value(aria_label)
-            selector = f'{tag}[aria-label="{escaped_aria_label}"]'
-            logger.info(f"Generated selector from aria-label: {selector}")
-            return selector, False
+            return f'{tag}[aria-label="{escaped_aria_label}"]', False, "aria-label"
 
     # Priority 4: tag + classes (fragile)
-    classes = element_info.get("classes", [])
-    # Filter out empty or whitespace-only class names
-    classes = [c.strip() for c in classes if c and c.strip()]
     if classes:
         class_selector = ".".join(classes)
-        selector = f"{tag}.{class_selector}"
-        logger.info(f"Generated fragile selector from classes: {selector}")
-        return selector, True
+        return f"{tag}.{class_selector}", True, "classes"
 
     # Priority 5: tag only (very fragile)
-    logger.warning(f"Generated very fragile tag-only selector: {tag}")
-    return tag, True
+    return tag, True, "tag"
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -35,6 +36,8 @@ class RecordingSession:
     url: str
     headed: bool = True
     settle_timeout: int = 200
+    # Called whenever the page records an action (see ActionTracker)
+    on_action: Callable[[], None] | None = None
 
     # Private fields (not part of constructor args)
     _playwright: Playwright | None = field(default=None, init=False, repr=False)
@@ -80,7 +83,7 @@ class RecordingSession:
         logger.info(f"Navigated to {self.url}")
 
         # Set up action tracking and change observation
-        self._tracker = ActionTracker(self._page)
+        self._tracker = ActionTracker(self._page, on_action=self.on_action)
         self._observer = ChangeObserver(self._page, settle_timeout=self.settle_timeout)
 
         await self._tracker.start()
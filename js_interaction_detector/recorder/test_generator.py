@@ -11,7 +11,7 @@ def _escape_typescript_string(value: str) -> str:
     return value.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DOMChange:
     """A DOM change observation."""
 
@@ -20,7 +20,7 @@ class DOMChange:
     text: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CSSChange:
     """A CSS property change observation."""
 
@@ -29,7 +29,7 @@ class CSSChange:
     value: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NetworkRequest:
     """A network request observation."""
 
@@ -37,7 +37,7 @@ class NetworkRequest:
     url_pattern: str
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordedAction:
     """A recorded user action with its observed changes."""
 
@@ -1,5 +1,6 @@
 """Infer validation rules from JavaScript code via pattern matching."""
 
+import functools
 import logging
 import re
 from dataclasses import dataclass
@@ -7,9 +8,12 @@ from dataclasses import dataclass
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class InferredRule:
-    """Result of validation rule inference."""
+    """Result of validation rule inference.
+
+    Frozen because infer_validation_rule caches and shares instances.
+    """
 
     type: str
     description: str
@@ -116,14 +120,34 @@ PATTERNS = [
 def infer_validation_rule(code: str) -> InferredRule:
     """Infer the validation rule type from JavaScript code.
 
+    Results are cached by code: frameworks often attach the same handler
+    source to many inputs, and each distinct handler only needs matching once.
+
     Args:
         code: The JavaScript validation function code
 
     Returns:
         InferredRule with type, description, and confidence
     """
-    if not code or not code.strip():
+    rule = _infer_rule(code)
+
+    # Logged here rather than in the cached matcher, so repeated handlers
+    # are still logged
+    if rule.type != "unknown":
+        logger.info(
+            "Inferred rule type '%s' with confidence '%s'", rule.type, rule.confidence
+        )
+    elif not code or not code.strip():
         logger.info("Empty code, returning unknown")
+    else:
+        logger.info("No pattern matched, returning unknown")
+    return rule
+
+
+@functools.lru_cache(maxsize=2048)
+def _infer_rule(code: str) -> InferredRule:
+    """infer_validation_rule without logging, memoized on the code."""
+    if not code or not code.strip():
         return InferredRule(
             type="unknown",
             description="Could not determine validation rule",
@@ -150,10 +174,6 @@ def infer_validation_rule(code: str) -> InferredRule:
                         "description", f"Validation rule: {pattern_def['type']}"
                     )
 
-                logger.info(
-                    f"Inferred rule type '{pattern_def['type']}' "
-                    f"with confidence '{pattern_def['confidence']}'"
-                )
                 return InferredRule(
                     type=pattern_def["type"],
                     description=description,
@@ -161,7 +181,6 @@ def infer_validation_rule(code: str) -> InferredRule:
                 )
 
     # No pattern matched
-    logger.info("No pattern matched, returning unknown")
     return InferredRule(
         type="unknown",
         description="Could not determine validation rule",
@@ -1,12 +1,15 @@
 """Tests for the main analyzer."""
 
+import asyncio
 import json
 from pathlib import Path
 
 import pytest
 
-from js_interaction_detector.analyzer import analyze_page
+from js_interaction_detector import analyzer, page_loader
+from js_interaction_detector.analyzer import analyze_page, analyze_pages
 from js_interaction_detector.models import AnalysisResult
+from js_interaction_detector.page_loader import BrowserPool
 
 
 @pytest.fixture
@@ -24,6 +27,16 @@ class TestAnalyzer:
     async def when_page_is_analyzed(self):
         self.result = await analyze_page(self.url)
 
+    async def when_page_is_analyzed_with_wait_strategy(self, wait_strategy):
+        self.result = await analyze_page(self.url, wait_strategy=wait_strategy)
+
+    async def when_page_is_analyzed_twice_with_shared_pool(self):
+        async with BrowserPool() as pool:
+            self.results = [
+                await analyze_page(self.url, pool=pool),
+                await analyze_page(self.url, pool=pool),
+            ]
+
     def then_result_is_valid(self):
         assert isinstance(self.result, AnalysisResult)
         assert self.result.url == self.url
@@ -43,6 +56,11 @@ class TestAnalyzer:
         )
         assert "blur" in email_interaction.triggers
 
+    def then_each_result_detects_email_validation(self):
+        for result in self.results:
+            assert result.errors == []
+            assert any("email" in i.element.selector for i in result.interactions)
+
     def then_result_has_errors(self):
         assert len(self.result.errors) > 0
         assert self.result.errors[0].phase == "loading"
@@ -74,6 +92,13 @@ class TestAnalyzer:
         await self.when_page_is_analyzed()
         self.then_email_has_blur_trigger()
 
+    @pytest.mark.asyncio
+    async def test_reuses_shared_browser_pool(self, fixtures_path):
+        """analyze_page can run repeatedly against one shared BrowserPool."""
+        self.given_form_with_validation_url(fixtures_path)
+        await self.when_page_is_analyzed_twice_with_shared_pool()
+        self.then_each_result_detects_email_validation()
+
     @pytest.mark.asyncio
     async def test_returns_error_for_invalid_url(self):
         """analyze_page returns errors array for invalid URLs."""
@@ -81,9 +106,179 @@ class TestAnalyzer:
         await self.when_page_is_analyzed()
         self.then_result_has_errors()
 
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_wait_strategy(self, fixtures_path):
+        """analyze_page raises ValueError for an unknown wait strategy."""
+        self.given_form_with_validation_url(fixtures_path)
+        with pytest.raises(ValueError, match="Unknown wait strategy"):
+            await self.when_page_is_analyzed_with_wait_strategy("eventually")
+
     @pytest.mark.asyncio
     async def test_result_serializes_to_valid_json(self, fixtures_path):
         """analyze_page result can be serialized to valid JSON."""
         self.given_form_with_validation_url(fixtures_path)
         await self.when_page_is_analyzed()
         self.then_result_serializes_to_json()
+
+
+class FakeCdpSession:
+    """A CDP session that records what was sent over it."""
+
+    def __init__(self):
+        self.sent = []
+        self.detached = False
+
+    async def send(self, method, params=None):
+        self.sent.append(method)
+        return {}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def goto(self, url, wait_until):
+        pass
+
+    async def wait_for_load_state(self, state, timeout):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        # Two input elements for listener extraction, nothing for resets
+        if arg is None:
+            return None
+        return [
+            {"tag": "input", "id": "email", "name": ""},
+            {"tag": "input", "id": "", "name": "phone"},
+        ]
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cdp_sessions = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page):
+        session = FakeCdpSession()
+        self.cdp_sessions.append(session)
+        return session
+
+    async def clear_cookies(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    browser = None
+
+    def __init__(self):
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self):
+        FakePlaywright.browser = FakeBrowser()
+        return FakePlaywright.browser
+
+    async def stop(self):
+        pass
+
+
+class TestAnalyzerCdpSession:
+    def given_fake_browser(self, monkeypatch):
+        monkeypatch.setattr(page_loader, "async_playwright", FakePlaywright)
+
+    async def when_page_is_analyzed(self):
+        async with BrowserPool() as pool:
+            self.result = await analyze_page("http://example.com", pool=pool)
+        (context,) = FakePlaywright.browser.contexts
+        self.sessions = context.cdp_sessions
+
+    def then_one_session_served_every_lookup(self):
+        assert len(self.sessions) == 1
+        assert self.sessions[0].sent == [
+            "Debugger.enable",
+            "Runtime.evaluate",
+            "Runtime.evaluate",
+        ]
+        assert self.result.errors == []
+
+    def then_session_is_detached(self):
+        assert self.sessions[0].detached
+
+    @pytest.mark.asyncio
+    async def test_reuses_one_cdp_session_per_page(self, monkeypatch):
+        """analyze_page attaches one CDP session per page and detaches it."""
+        self.given_fake_browser(monkeypatch)
+        await self.when_page_is_analyzed()
+        self.then_one_session_served_every_lookup()
+        self.then_session_is_detached()
+
+
+class TestAnalyzePagesStoppedEarly:
+    def given_one_fast_page_and_two_slow_ones(self, monkeypatch):
+        self.cancelled = []
+
+        async def fake_analyze_page(url, pool, wait_strategy):
+            if url != "http://fast.example":
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    self.cancelled.append(url)
+                    raise
+            return AnalysisResult(
+                url=url, analyzed_at="now", errors=[], interactions=[]
+            )
+
+        monkeypatch.setattr(analyzer, "analyze_page", fake_analyze_page)
+        self.urls = [
+            "http://fast.example",
+            "http://slow1.example",
+            "http://slow2.example",
+        ]
+
+    async def when_consumer_stops_after_first_result(self):
+        results = analyze_pages(self.urls, pool=None)
+        self.first = await anext(results)
+        await results.aclose()
+
+    def then_unfinished_analyses_are_cancelled(self):
+        assert self.first.url == "http://fast.example"
+        assert sorted(self.cancelled) == [
+            "http://slow1.example",
+            "http://slow2.example",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cancels_unfinished_analyses(self, monkeypatch):
+        """Closing the result stream early cancels the analyses still running."""
+        self.given_one_fast_page_and_two_slow_ones(monkeypatch)
+        await self.when_consumer_stops_after_first_result()
+        self.then_unfinished_analyses_are_cancelled()
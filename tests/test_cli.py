@@ -1,13 +1,15 @@
 """Tests for CLI interface."""
 
+import asyncio
 import json
+import signal
 from io import StringIO
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from js_interaction_detector.cli import run_cli
+from js_interaction_detector.cli import parse_args, run_cli
 
 
 @pytest.fixture
@@ -102,6 +104,17 @@ class TestCLISubcommands:
         self.url = f"file://{fixtures_path}/simple_form.html"
         self.args = [self.url]
 
+    def given_analyze_command_with_two_urls(self, fixtures_path):
+        self.urls = [
+            f"file://{fixtures_path}/form_with_validation.html",
+            f"file://{fixtures_path}/simple_form.html",
+        ]
+        self.args = ["analyze", *self.urls, "--concurrency", "2"]
+
+    def given_analyze_command_with_ndjson(self, fixtures_path):
+        self.url = f"file://{fixtures_path}/form_with_validation.html"
+        self.args = ["analyze", self.url, "--ndjson"]
+
     def given_help_flag(self):
         self.args = ["--help"]
 
@@ -119,6 +132,16 @@ class TestCLISubcommands:
         output = json.loads(self.captured.out)
         assert "url" in output
 
+    def then_stdout_has_one_json_line_per_url(self):
+        lines = self.captured.out.strip().splitlines()
+        assert sorted(json.loads(line)["url"] for line in lines) == sorted(self.urls)
+
+    def then_stdout_streams_interaction_lines(self):
+        records = [json.loads(line) for line in self.captured.out.splitlines()]
+        assert records
+        assert all(record["url"] == self.url for record in records)
+        assert any("interaction" in record for record in records)
+
     def then_stderr_mentions_subcommands(self):
         assert "analyze" in self.captured.err or "analyze" in self.captured.out
         assert "record" in self.captured.err or "record" in self.captured.out
@@ -141,6 +164,22 @@ class TestCLISubcommands:
         self.then_exit_code_is_zero()
         self.then_stdout_is_valid_json()
 
+    @pytest.mark.asyncio
+    async def test_analyze_multiple_urls_outputs_ndjson(self, fixtures_path, capsys):
+        """'analyze' with several URLs prints one JSON line per page."""
+        self.given_analyze_command_with_two_urls(fixtures_path)
+        await self.when_cli_is_run_capturing_output(capsys)
+        self.then_exit_code_is_zero()
+        self.then_stdout_has_one_json_line_per_url()
+
+    @pytest.mark.asyncio
+    async def test_analyze_ndjson_streams_interactions(self, fixtures_path, capsys):
+        """'analyze --ndjson' prints one JSON line per interaction."""
+        self.given_analyze_command_with_ndjson(fixtures_path)
+        await self.when_cli_is_run_capturing_output(capsys)
+        self.then_exit_code_is_zero()
+        self.then_stdout_streams_interaction_lines()
+
     @pytest.mark.asyncio
     async def test_help_shows_subcommands(self, capsys):
         """--help shows available subcommands."""
@@ -149,6 +188,48 @@ class TestCLISubcommands:
         self.then_stderr_mentions_subcommands()
 
 
+class TestParseArgs:
+    def given_args(self, *args):
+        self.args = list(args)
+
+    def when_args_are_parsed(self):
+        self.parsed = parse_args(self.args)
+
+    def then_command_is(self, command):
+        assert self.parsed.command == command
+
+    def test_record_args_parse_with_defaults(self):
+        """'record' parses its own flags without the other subcommands."""
+        self.given_args("record", "http://example.com", "--headless")
+        self.when_args_are_parsed()
+        self.then_command_is("record")
+        assert self.parsed.url == "http://example.com"
+        assert self.parsed.headless is True
+        assert self.parsed.timeout == 2000
+
+    def test_bare_url_parses_as_analyze(self):
+        """A bare URL is parsed with the analyze subcommand's defaults."""
+        self.given_args("http://example.com")
+        self.when_args_are_parsed()
+        self.then_command_is("analyze")
+        assert self.parsed.url == ["http://example.com"]
+        assert self.parsed.concurrency == 8
+        assert self.parsed.wait == "fast"
+
+    def test_analyze_accepts_wait_strategy(self):
+        """'analyze --wait strict' selects the network-idle wait strategy."""
+        self.given_args("analyze", "http://example.com", "--wait", "strict")
+        self.when_args_are_parsed()
+        self.then_command_is("analyze")
+        assert self.parsed.wait == "strict"
+
+    def test_analyze_rejects_unknown_wait_strategy(self):
+        """'analyze --wait' only accepts the known strategies."""
+        self.given_args("analyze", "http://example.com", "--wait", "eventually")
+        with pytest.raises(SystemExit):
+            self.when_args_are_parsed()
+
+
 class TestRecordCommand:
     """Test the record command that generates Playwright tests."""
 
@@ -203,6 +284,119 @@ class TestRecordCommand:
         self.then_stderr_mentions_recording()
 
 
+class FakeRecordingSession:
+    """A recording session whose page reports actions on demand.
+
+    The first processing pass reports another action while it runs, like a
+    user clicking while earlier actions are still being processed.
+    """
+
+    def __init__(self, url, headed, settle_timeout, on_action):
+        self._on_action = on_action
+        self._browser = None
+        self._playwright = None
+        self.unread = []
+        self.passes = []
+
+    def report_action(self, name):
+        self.unread.append(name)
+        self._on_action()
+
+    async def __aenter__(self):
+        FakeRecordingSession.instance = self
+        self.report_action("first")
+        return self
+
+    async def process_pending_actions(self):
+        read, self.unread = self.unread, []
+        self.passes.append(read)
+        if len(self.passes) == 1:
+            await asyncio.sleep(0)
+            self.report_action("during first pass")
+            await asyncio.sleep(0)
+
+    def get_recorded_actions(self):
+        return []
+
+
+class TestRecordActionProcessing:
+    """Test that actions reported mid-pass are still processed."""
+
+    def given_record_command(self, tmp_path):
+        self.args = [
+            "record",
+            "file:///page.html",
+            "--output",
+            str(tmp_path / "test-recorded.spec.ts"),
+            "--headless",
+        ]
+
+    async def when_recording_with_fake_session(self):
+        with patch(
+            "js_interaction_detector.cli.RecordingSession", FakeRecordingSession
+        ):
+            self.exit_code = await run_cli(self.args)
+        self.session = FakeRecordingSession.instance
+
+    def then_action_reported_mid_pass_gets_its_own_pass(self):
+        assert self.exit_code == 0
+        # The final pass at shutdown finds nothing left unread
+        assert self.session.passes == [["first"], ["during first pass"], []]
+
+    @pytest.mark.asyncio
+    async def test_reprocesses_actions_reported_during_a_pass(self, tmp_path):
+        """An action reported while a pass runs triggers a follow-up pass."""
+        self.given_record_command(tmp_path)
+        await self.when_recording_with_fake_session()
+        self.then_action_reported_mid_pass_gets_its_own_pass()
+
+
+class TestRecordWithoutLoopSignalHandlers:
+    """Test headed recording on event loops without add_signal_handler."""
+
+    def given_headed_record_command(self, tmp_path):
+        self.output = tmp_path / "test-recorded.spec.ts"
+        self.args = ["record", "file:///page.html", "--output", str(self.output)]
+
+    def given_loop_without_signal_handlers(self, monkeypatch):
+        # As on Windows event loops
+        def unsupported(*args):
+            raise NotImplementedError
+
+        monkeypatch.setattr(
+            asyncio.get_running_loop(), "add_signal_handler", unsupported
+        )
+        self.original_handler = signal.getsignal(signal.SIGINT)
+
+    async def when_recording_is_interrupted(self):
+        async def interrupt():
+            await asyncio.sleep(0.1)
+            signal.raise_signal(signal.SIGINT)
+
+        interrupter = asyncio.create_task(interrupt())
+        with patch(
+            "js_interaction_detector.cli.RecordingSession", FakeRecordingSession
+        ):
+            self.exit_code = await asyncio.wait_for(run_cli(self.args), timeout=5)
+        await interrupter
+
+    def then_recording_stops_and_writes_the_test(self):
+        assert self.exit_code == 0
+        assert self.output.exists()
+
+    def then_original_sigint_handler_is_restored(self):
+        assert signal.getsignal(signal.SIGINT) is self.original_handler
+
+    @pytest.mark.asyncio
+    async def test_ctrl_c_stops_recording(self, tmp_path, monkeypatch):
+        """Ctrl+C still stops a headed recording without loop signal support."""
+        self.given_headed_record_command(tmp_path)
+        self.given_loop_without_signal_handlers(monkeypatch)
+        await self.when_recording_is_interrupted()
+        self.then_recording_stops_and_writes_the_test()
+        self.then_original_sigint_handler_is_restored()
+
+
 class TestFunctionalCommand:
     """Tests for the functional API testing command."""
 
@@ -6,9 +6,11 @@ import pytest
 
 from js_interaction_detector.enumerator.extractor import (
     AccessibilityElement,
+    collect_interactive_elements,
     extract_interactive_elements,
     filter_interactive_elements,
     flatten_tree,
+    iter_cdp_ax_nodes,
 )
 from js_interaction_detector.page_loader import PageLoader
 
@@ -78,6 +80,31 @@ class TestFlattenTree:
         nodes = flatten_tree(tree)
         assert len(nodes) == 1
 
+    def test_preserves_document_order(self):
+        """Returns nodes in pre-order, parents before their children."""
+        tree = {
+            "role": "WebArea",
+            "children": [
+                {"role": "form", "children": [{"role": "textbox"}]},
+                {"role": "button"},
+            ],
+        }
+
+        nodes = flatten_tree(tree)
+
+        assert [n["role"] for n in nodes] == ["WebArea", "form", "textbox", "button"]
+
+    def test_handles_deeply_nested_tree(self):
+        """Flattens trees deeper than the Python recursion limit."""
+        depth = 5000
+        tree = {"role": "generic"}
+        for _ in range(depth - 1):
+            tree = {"role": "generic", "children": [tree]}
+
+        nodes = flatten_tree(tree)
+
+        assert len(nodes) == depth
+
 
 class TestFilterInteractiveElements:
     """Tests for filter_interactive_elements function."""
@@ -101,6 +128,14 @@ class TestFilterInteractiveElements:
         assert "heading" not in roles
         assert "text" not in roles
 
+    def test_normalizes_role_case(self):
+        """Matches interactive roles case-insensitively and reports them lowercase."""
+        nodes = [{"role": "Button", "name": "Submit"}]
+
+        elements = filter_interactive_elements(nodes)
+
+        assert [el.role for el in elements] == ["button"]
+
     def test_preserves_element_properties(self):
         """Preserves element properties in AccessibilityElement."""
         nodes = [
@@ -122,6 +157,99 @@ class TestFilterInteractiveElements:
         assert el.disabled is False
 
 
+class TestCollectInteractiveElements:
+    """Tests for collect_interactive_elements function."""
+
+    def test_matches_flatten_then_filter(self):
+        """Produces the same elements as flattening then filtering."""
+        tree = {
+            "role": "WebArea",
+            "name": "Page",
+            "children": [
+                {"role": "button", "name": "Submit"},
+                {
+                    "role": "form",
+                    "name": "Login",
+                    "children": [
+                        {"role": "textbox", "name": "Email"},
+                        {"role": "button", "name": "Cancel"},
+                    ],
+                },
+            ],
+        }
+
+        elements, role_counts = collect_interactive_elements(tree)
+
+        assert elements == filter_interactive_elements(flatten_tree(tree))
+        assert role_counts == {"button": 2, "textbox": 1}
+
+    def test_handles_none_input(self):
+        """Returns no elements and no counts for None input."""
+        elements, role_counts = collect_interactive_elements(None)
+
+        assert elements == []
+        assert not role_counts
+
+
+class TestIterCdpAxNodes:
+    """Tests for iter_cdp_ax_nodes function."""
+
+    def test_yields_nodes_in_document_order(self):
+        """Rebuilds pre-order from childIds regardless of list order."""
+        raw_nodes = [
+            {"nodeId": "3", "parentId": "1", "role": {"value": "link"}},
+            {"nodeId": "1", "role": {"value": "RootWebArea"}, "childIds": ["2", "3"]},
+            {"nodeId": "2", "parentId": "1", "role": {"value": "button"}},
+        ]
+
+        roles = [node["role"] for node in iter_cdp_ax_nodes(raw_nodes)]
+
+        assert roles == ["RootWebArea", "button", "link"]
+
+    def test_skips_ignored_nodes_but_keeps_their_children(self):
+        """Ignored nodes are not yielded, but their descendants are."""
+        raw_nodes = [
+            {"nodeId": "1", "role": {"value": "RootWebArea"}, "childIds": ["2"]},
+            {
+                "nodeId": "2",
+                "parentId": "1",
+                "ignored": True,
+                "role": {"value": "none"},
+                "childIds": ["3"],
+            },
+            {"nodeId": "3", "parentId": "2", "role": {"value": "button"}},
+        ]
+
+        roles = [node["role"] for node in iter_cdp_ax_nodes(raw_nodes)]
+
+        assert roles == ["RootWebArea", "button"]
+
+    def test_maps_properties_to_snapshot_fields(self):
+        """Unwraps CDP values into snapshot-style node fields."""
+        raw_nodes = [
+            {
+                "nodeId": "1",
+                "role": {"type": "role", "value": "checkbox"},
+                "name": {"type": "computedString", "value": "Remember me"},
+                "properties": [
+                    {"name": "checked", "value": {"type": "tristate", "value": "true"}},
+                    {"name": "disabled", "value": {"type": "boolean", "value": True}},
+                ],
+            },
+        ]
+
+        (node,) = iter_cdp_ax_nodes(raw_nodes)
+
+        assert node == {
+            "role": "checkbox",
+            "name": "Remember me",
+            "value": None,
+            "checked": True,
+            "disabled": True,
+            "expanded": None,
+        }
+
+
 class TestExtractInteractiveElements:
     """Integration tests for extract_interactive_elements."""
 
@@ -1,13 +1,17 @@
 """Tests for enumeration test generator."""
 
+import io
+
 from js_interaction_detector.enumerator.extractor import AccessibilityElement
 from js_interaction_detector.enumerator.test_generator import (
     escape_string,
     generate_button_test,
     generate_checkbox_test,
     generate_enumeration_tests,
+    generate_generic_test,
     generate_link_test,
     generate_textbox_test,
+    write_enumeration_tests,
 )
 
 
@@ -29,6 +33,11 @@ class TestEscapeString:
         result = escape_string("")
         assert result == ""
 
+    def test_returns_plain_string_unchanged(self):
+        """Returns strings without special characters as-is."""
+        name = "Submit order"
+        assert escape_string(name) is name
+
 
 class TestGenerateButtonTest:
     """Tests for generate_button_test function."""
@@ -57,6 +66,15 @@ class TestGenerateButtonTest:
 
         assert 'button "Submit" (2)' in code
 
+    def test_renders_button_test_whatever_the_element_role(self):
+        """Always renders a button test, even for an element with another role."""
+        el = AccessibilityElement(role="link", name="Submit")
+        code = generate_button_test(el)
+
+        assert 'button "Submit" is interactive' in code
+        assert "getByRole('button', { name: 'Submit' })" in code
+        assert "toHaveAttribute('href'" not in code
+
 
 class TestGenerateLinkTest:
     """Tests for generate_link_test function."""
@@ -108,6 +126,27 @@ class TestGenerateCheckboxTest:
         assert "toBeChecked()" in code
 
 
+class TestGenerateGenericTest:
+    """Tests for generate_generic_test function."""
+
+    def test_generates_generic_test(self):
+        """Generates an "is interactive" test for the element's own role."""
+        el = AccessibilityElement(role="menuitem", name="Settings")
+        code = generate_generic_test(el)
+
+        assert 'menuitem "Settings" is interactive' in code
+        assert "getByRole('menuitem', { name: 'Settings' })" in code
+
+    def test_uses_generic_form_for_roles_with_their_own_test(self):
+        """Roles with a specific test still get the generic form."""
+        el = AccessibilityElement(role="checkbox", name="Remember me")
+        code = generate_generic_test(el)
+
+        assert 'checkbox "Remember me" is interactive' in code
+        assert "getByRole('checkbox', { name: 'Remember me' })" in code
+        assert "check()" not in code
+
+
 class TestGenerateEnumerationTests:
     """Tests for generate_enumeration_tests function."""
 
@@ -167,6 +206,21 @@ class TestGenerateEnumerationTests:
         assert 'button "Submit" (1)' in content
         assert 'button "Submit" (2)' in content
 
+    def test_numbers_interleaved_duplicates_in_order(self):
+        """Numbers duplicates by position even when other names sit between."""
+        elements = [
+            AccessibilityElement(role="button", name="Delete"),
+            AccessibilityElement(role="button", name="Edit"),
+            AccessibilityElement(role="button", name="Delete"),
+        ]
+
+        content, warnings = generate_enumeration_tests("http://example.com", elements)
+
+        assert 'button "Delete" (1)' in content
+        assert 'button "Delete" (2)' in content
+        assert "name: 'Delete' }).nth(1)" in content
+        assert 'button "Edit" is interactive' in content
+
     def test_returns_empty_tests_for_no_named_elements(self):
         """Returns minimal test file when no named elements."""
         elements = [
@@ -179,3 +233,22 @@ class TestGenerateEnumerationTests:
         assert "test.describe('Accessibility Elements'" in content
         # But no actual test blocks for buttons
         assert "test.describe('Buttons'" not in content
+
+
+class TestWriteEnumerationTests:
+    """Tests for write_enumeration_tests function."""
+
+    def test_writes_same_content_as_generate(self):
+        """Streams exactly what generate_enumeration_tests returns."""
+        elements = [
+            AccessibilityElement(role="button", name="Submit"),
+            AccessibilityElement(role="button", name="Submit"),
+            AccessibilityElement(role="link", name="Home"),
+            AccessibilityElement(role="textbox", name=""),
+        ]
+        out = io.StringIO()
+
+        warnings = write_enumeration_tests("http://example.com", elements, out)
+
+        expected = generate_enumeration_tests("http://example.com", elements)
+        assert (out.getvalue(), warnings) == expected
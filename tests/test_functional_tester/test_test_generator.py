@@ -97,3 +97,19 @@ class TestGenerateTestFile:
 
         # Should have 2 tests, not 3
         assert test_file.count("test(") == 2
+
+    def test_uses_given_function_names_for_imports(self):
+        """Imports the given function names in the given order."""
+        calls = [
+            CapturedCall(
+                function_name="add",
+                inputs=["1", "2"],
+                output="3",
+                location="src/math.js:10",
+                is_complete=True,
+            ),
+        ]
+
+        test_file = generate_test_file("my-lib", calls, ["sum", "add"])
+
+        assert "import { sum, add } from 'my-lib'" in test_file
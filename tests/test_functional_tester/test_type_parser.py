@@ -48,3 +48,16 @@ class TestParseDtsFile:
         assert identity is not None
         assert identity.parameters == [("value", "T")]
         assert identity.return_type == "T"
+
+    def test_parses_crlf_line_endings(self, tmp_path):
+        """Parses files with Windows line endings like Unix ones."""
+        dts_path = tmp_path / "crlf.d.ts"
+        dts_path.write_bytes(
+            b"export function add(a: number,\r\n  b: number): number;\r\n"
+        )
+
+        signatures = parse_dts_file(dts_path)
+
+        assert len(signatures) == 1
+        assert signatures[0].parameters == [("a", "number"), ("b", "number")]
+        assert signatures[0].return_type == "number"
@@ -5,9 +5,12 @@ from pathlib import Path
 
 import pytest
 
+from js_interaction_detector.functional_tester import usage_detector
 from js_interaction_detector.functional_tester.usage_detector import (
+    detect_usage,
     find_call_sites,
     find_imports,
+    iter_usage,
 )
 
 
@@ -82,3 +85,78 @@ class TestFindCallSites:
 
         assert len(call_sites) == 1
         assert call_sites[0].line_number > 0
+
+    def test_finds_calls_nested_in_other_calls(self):
+        """Finds a call passed as another call's argument, in source order."""
+        content = "const x = 1;\nmap(filter(items, isActive), toName);\n"
+
+        call_sites = find_call_sites(content, {"map", "filter"}, "inline.js")
+
+        assert [(c.function_name, c.line_number) for c in call_sites] == [
+            ("map", 2),
+            ("filter", 2),
+        ]
+        assert call_sites[1].arguments == ["items", "isActive"]
+
+    def test_string_ending_in_escaped_backslash_closes(self):
+        """A quote after an escaped backslash ends the string argument."""
+        content = "map('C:\\\\', toPath);\n"
+
+        call_sites = find_call_sites(content, {"map"}, "inline.js")
+
+        assert call_sites[0].arguments == ["'C:\\\\'", "toPath"]
+
+
+class TestDetectUsage:
+    """Tests for detect_usage function."""
+
+    def test_scans_nested_sources_and_skips_node_modules(self, tmp_path):
+        """Finds calls in nested source files but not inside node_modules."""
+        source = "import { map } from 'lodash';\nmap(items, toName);\n"
+        (tmp_path / "src" / "lib").mkdir(parents=True)
+        (tmp_path / "src" / "lib" / "app.ts").write_text(source)
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text(source)
+        (tmp_path / "notes.txt").write_text(source)
+
+        call_sites = detect_usage(tmp_path, "lodash")
+
+        assert [Path(c.file_path).name for c in call_sites] == ["app.ts"]
+
+    def test_parallel_scan_matches_serial_scan(self, tmp_path, monkeypatch):
+        """Scanning in worker processes finds the same calls, in order."""
+        for i in range(4):
+            (tmp_path / f"file{i}.js").write_text(
+                f"import {{ map }} from 'lodash';\nmap(items, {i});\n"
+            )
+        serial = detect_usage(tmp_path, "lodash")
+
+        monkeypatch.setattr(usage_detector, "PARALLEL_MIN_FILES", 1)
+        parallel = detect_usage(tmp_path, "lodash")
+
+        assert parallel == serial
+        assert len(parallel) == 4
+
+    def test_skips_oversized_files(self, tmp_path, monkeypatch):
+        """Files larger than MAX_SOURCE_BYTES are not scanned."""
+        source = "import { map } from 'lodash';\nmap(items, toName);\n"
+        (tmp_path / "small.js").write_text(source)
+        (tmp_path / "bundle.js").write_text(source + "// padding\n" * 10)
+        (tmp_path / "empty.js").write_text("")
+        monkeypatch.setattr(usage_detector, "MAX_SOURCE_BYTES", len(source))
+
+        call_sites = detect_usage(tmp_path, "lodash")
+
+        assert [Path(c.file_path).name for c in call_sites] == ["small.js"]
+
+    def test_iter_usage_streams_the_same_call_sites(self, tmp_path):
+        """iter_usage lazily yields what detect_usage returns as a list."""
+        for i in range(3):
+            (tmp_path / f"file{i}.js").write_text(
+                f"import {{ map }} from 'lodash';\nmap(items, {i});\n"
+            )
+
+        streamed = iter_usage(tmp_path, "lodash")
+
+        assert not isinstance(streamed, list)
+        assert list(streamed) == detect_usage(tmp_path, "lodash")
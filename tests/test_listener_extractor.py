@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from js_interaction_detector.enumerator import extract_interactive_elements
 from js_interaction_detector.listener_extractor import extract_listeners
 from js_interaction_detector.page_loader import PageLoader
 
@@ -17,6 +18,9 @@ class TestListenerExtractor:
     def given_form_with_validation_url(self, fixtures_path):
         self.url = f"file://{fixtures_path}/form_with_validation.html"
 
+    def given_regex_validation_url(self, fixtures_path):
+        self.url = f"file://{fixtures_path}/regex_validation.html"
+
     async def when_listeners_are_extracted(self):
         async with PageLoader() as loader:
             page = await loader.load(self.url)
@@ -86,3 +90,71 @@ class TestListenerExtractor:
         self.given_form_with_validation_url(fixtures_path)
         await self.when_listeners_are_extracted()
         self.then_listeners_exclude_selector("bio")
+
+    @pytest.mark.asyncio
+    async def test_captures_whole_listener_with_url_regex(self, fixtures_path):
+        """A "//" inside a regex literal doesn't cut the listener code short."""
+        self.given_regex_validation_url(fixtures_path)
+        await self.when_listeners_are_extracted()
+        self.then_listener_code_contains("website", "dataset.checked = 'website'")
+
+    @pytest.mark.asyncio
+    async def test_captures_whole_listener_with_quote_class_regex(self, fixtures_path):
+        """A quote inside a regex character class doesn't open a string."""
+        self.given_regex_validation_url(fixtures_path)
+        await self.when_listeners_are_extracted()
+        self.then_listener_code_contains("nickname", "dataset.checked = 'nickname'")
+
+
+class FakeCdpSession:
+    def __init__(self):
+        self.sent = []
+        self.detached = False
+
+    async def send(self, method, params=None):
+        self.sent.append(method)
+        return {}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakeCdpPage:
+    """A page with no inputs whose context counts attached CDP sessions."""
+
+    def __init__(self):
+        self.context = self
+        self.sessions = []
+
+    async def evaluate(self, script, arg=None):
+        return []
+
+    async def new_cdp_session(self, page):
+        session = FakeCdpSession()
+        self.sessions.append(session)
+        return session
+
+
+class TestSharedCdpSession:
+    def given_page_with_attached_session(self):
+        self.page = FakeCdpPage()
+        self.session = FakeCdpSession()
+
+    async def when_extractors_share_the_session(self):
+        await extract_listeners(self.page, client=self.session)
+        await extract_interactive_elements(self.page, client=self.session)
+
+    def then_one_session_served_both_extractors(self):
+        assert self.page.sessions == []
+        assert self.session.sent == ["Debugger.enable", "Accessibility.getFullAXTree"]
+
+    def then_session_is_left_attached(self):
+        assert not self.session.detached
+
+    @pytest.mark.asyncio
+    async def test_extractors_reuse_caller_session(self):
+        """Listener and accessibility extraction share a caller's CDP session."""
+        self.given_page_with_attached_session()
+        await self.when_extractors_share_the_session()
+        self.then_one_session_served_both_extractors()
+        self.then_session_is_left_attached()
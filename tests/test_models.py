@@ -2,12 +2,14 @@
 
 import json
 
+from js_interaction_detector import models
 from js_interaction_detector.models import (
     AnalysisError,
     AnalysisResult,
     ElementInfo,
     Interaction,
     ValidationInfo,
+    to_ndjson_line,
 )
 
 
@@ -44,10 +46,28 @@ class TestAnalysisResult:
             interactions=[],
         )
 
+    def given_result_with_non_ascii_selector(self):
+        self.result = AnalysisResult(
+            url="https://example.com",
+            analyzed_at="2025-12-04T10:00:00Z",
+            errors=[],
+            interactions=[
+                Interaction(
+                    element=ElementInfo(selector='input[name="prénom"]', tag="input"),
+                    triggers=["blur"],
+                    validation=ValidationInfo(type="unknown", raw_code="… 🙂"),
+                )
+            ],
+        )
+
     def when_serialized_to_json(self):
         json_str = self.result.to_json()
         self.parsed = json.loads(json_str)
 
+    def when_serialized_to_compact_json(self):
+        self.json_str = self.result.to_json(indent=None)
+        self.parsed = json.loads(self.json_str)
+
     def then_json_has_expected_fields(self):
         assert self.parsed["url"] == "https://example.com"
         assert self.parsed["errors"] == []
@@ -58,6 +78,33 @@ class TestAnalysisResult:
         assert "rule_description" not in interaction["validation"]
         assert "confidence" not in interaction["validation"]
 
+    def when_serialized_to_json_with_indent(self, indent):
+        self.json_str = self.result.to_json(indent=indent)
+        self.parsed = json.loads(self.json_str)
+
+    def when_serialized_without_orjson(self, monkeypatch, indent):
+        with monkeypatch.context() as patched:
+            patched.setattr(models, "orjson", None)
+            self.stdlib_json_str = self.result.to_json(indent=indent)
+
+    def then_non_ascii_text_is_escaped(self):
+        assert self.json_str.isascii()
+        assert "pr\\u00e9nom" in self.json_str
+
+    def then_output_is_compact(self):
+        assert self.json_str == json.dumps(self.parsed, separators=(",", ":"))
+
+    def then_output_matches_stdlib_encoder(self):
+        assert self.json_str == self.stdlib_json_str
+
+    def then_output_is_a_single_line(self):
+        assert "\n" not in self.json_str
+
+    def then_non_ascii_text_round_trips(self):
+        interaction = self.parsed["interactions"][0]
+        assert interaction["element"]["selector"] == 'input[name="prénom"]'
+        assert interaction["validation"]["raw_code"] == "… 🙂"
+
     def then_errors_are_serialized(self):
         assert len(self.parsed["errors"]) == 1
         assert self.parsed["errors"][0]["phase"] == "extraction"
@@ -79,3 +126,79 @@ class TestAnalysisResult:
         self.given_result_with_error()
         self.when_serialized_to_json()
         self.then_errors_are_serialized()
+
+    def test_compact_json_is_a_single_line(self):
+        """to_json(indent=None) produces one line, suitable for NDJSON."""
+        self.given_result_with_error()
+        self.when_serialized_to_compact_json()
+        self.then_output_is_a_single_line()
+        self.then_errors_are_serialized()
+
+    def test_serializes_non_ascii_text(self):
+        """Non-ASCII selectors and code survive a JSON round trip."""
+        self.given_result_with_non_ascii_selector()
+        self.when_serialized_to_json()
+        self.then_non_ascii_text_round_trips()
+
+    def test_non_ascii_text_is_escaped_at_any_indent(self):
+        """JSON output is pure ASCII, so printing it works on any console."""
+        for indent in (None, 2, 4):
+            self.given_result_with_non_ascii_selector()
+            self.when_serialized_to_json_with_indent(indent)
+            self.then_non_ascii_text_is_escaped()
+            self.then_non_ascii_text_round_trips()
+
+    def test_output_does_not_depend_on_encoder(self, monkeypatch):
+        """orjson and the stdlib fallback write identical JSON."""
+        for indent in (None, 2):
+            self.given_result_with_non_ascii_selector()
+            self.when_serialized_to_json_with_indent(indent)
+            self.when_serialized_without_orjson(monkeypatch, indent)
+            self.then_output_matches_stdlib_encoder()
+
+    def test_compact_json_has_no_spaces_after_separators(self):
+        """Compact JSON uses "," and ":" separators, like NDJSON lines."""
+        self.given_result_with_non_ascii_selector()
+        self.when_serialized_to_compact_json()
+        self.then_output_is_compact()
+
+
+class TestToNdjsonLine:
+    def given_interaction(self):
+        self.item = Interaction(
+            element=ElementInfo(selector="input#email", tag="input"),
+            triggers=["blur"],
+            validation=ValidationInfo(type="email", raw_code="..."),
+        )
+
+    def given_error(self):
+        self.item = AnalysisError(element=None, error="Timeout", phase="loading")
+
+    def when_serialized_as_ndjson_line(self):
+        self.line = to_ndjson_line("https://example.com", self.item)
+        self.parsed = json.loads(self.line)
+
+    def then_line_is_tagged_with_url(self):
+        assert "\n" not in self.line
+        assert self.parsed["url"] == "https://example.com"
+
+    def then_line_holds_interaction_without_none_values(self):
+        assert self.parsed["interaction"]["element"]["selector"] == "input#email"
+        assert "confidence" not in self.parsed["interaction"]["validation"]
+
+    def then_line_holds_error(self):
+        assert self.parsed["error"]["phase"] == "loading"
+
+    def test_serializes_interaction(self):
+        """An interaction becomes one line with url and interaction keys."""
+        self.given_interaction()
+        self.when_serialized_as_ndjson_line()
+        self.then_line_is_tagged_with_url()
+        self.then_line_holds_interaction_without_none_values()
+
+    def test_serializes_error(self):
+        """An error becomes one line with url and error keys."""
+        self.given_error()
+        self.when_serialized_as_ndjson_line()
+        self.then_line_is_tagged_with_url()
+        self.then_line_holds_error()
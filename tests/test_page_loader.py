@@ -1,10 +1,17 @@
 """Tests for page loader."""
 
+import asyncio
 from pathlib import Path
 
 import pytest
 
-from js_interaction_detector.page_loader import PageLoader, PageLoadError
+from js_interaction_detector import page_loader
+from js_interaction_detector.page_loader import (
+    BrowserPool,
+    PageLoader,
+    PageLoadError,
+    open_page,
+)
 
 
 @pytest.fixture
@@ -22,9 +29,9 @@ class TestPageLoader:
     def given_unreachable_url(self):
         self.url = "https://localhost:99999/nonexistent"
 
-    async def when_page_is_loaded(self):
+    async def when_page_is_loaded(self, **kwargs):
         async with PageLoader() as loader:
-            self.page = await loader.load(self.url)
+            self.page = await loader.load(self.url, **kwargs)
 
     async def when_page_load_fails(self):
         async with PageLoader() as loader:
@@ -71,5 +78,126 @@ class TestPageLoader:
     async def test_waits_for_network_idle(self, sample_page_path):
         """PageLoader waits for network idle before returning."""
         self.given_local_file_url(sample_page_path)
+        await self.when_page_is_loaded(wait_strategy="strict")
+        await self.then_page_has_element("#test-form")
+
+    @pytest.mark.asyncio
+    async def test_fast_wait_returns_loaded_dom(self, sample_page_path):
+        """The default fast wait returns once the DOM is ready."""
+        self.given_local_file_url(sample_page_path)
         await self.when_page_is_loaded()
         await self.then_page_has_element("#test-form")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_wait_strategy(self, sample_page_path):
+        """PageLoader raises ValueError for an unknown wait strategy."""
+        self.given_local_file_url(sample_page_path)
+        with pytest.raises(ValueError):
+            await self.when_page_is_loaded(wait_strategy="eventually")
+
+
+class TestBrowserPool:
+    def given_local_file_url(self, sample_page_path):
+        self.url = f"file://{sample_page_path}"
+
+    async def when_contexts_are_borrowed_in_turn(self):
+        async with BrowserPool(max_contexts=1) as pool:
+            async with pool.context() as context:
+                await open_page(context, self.url)
+                await context.add_cookies(
+                    [{"name": "seen", "value": "1", "url": "http://localhost"}]
+                )
+                await context.grant_permissions(["geolocation"])
+                self.first = context
+                self.first_browser = context.browser
+            async with pool.context() as context:
+                self.second = context
+                self.second_browser = context.browser
+                self.second_pages = list(context.pages)
+                self.second_cookies = await context.cookies()
+
+    def then_each_borrow_gets_a_fresh_context(self):
+        assert self.second is not self.first
+        assert self.second_pages == []
+        assert self.second_cookies == []
+
+    def then_browser_is_shared(self):
+        assert self.second_browser is self.first_browser
+
+    @pytest.mark.asyncio
+    async def test_borrows_fresh_context_from_shared_browser(self, sample_page_path):
+        """Each borrow gets a new context, so no state leaks between borrowers."""
+        self.given_local_file_url(sample_page_path)
+        await self.when_contexts_are_borrowed_in_turn()
+        self.then_each_borrow_gets_a_fresh_context()
+        self.then_browser_is_shared()
+
+
+class FakeContext:
+    """A browser context whose close can be made to fail."""
+
+    def __init__(self):
+        self.closed = False
+        self.fail_close = False
+
+    async def close(self):
+        if self.fail_close:
+            raise RuntimeError("context crashed")
+        self.closed = True
+
+
+class FakeBrowser:
+    async def new_context(self):
+        return FakeContext()
+
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self):
+        return FakeBrowser()
+
+    async def stop(self):
+        pass
+
+
+class TestBrowserPoolCapacity:
+    def given_fake_browser(self, monkeypatch):
+        monkeypatch.setattr(page_loader, "async_playwright", FakePlaywright)
+
+    async def when_context_is_released_while_another_waits(self, fail_close=False):
+        async with BrowserPool(max_contexts=1) as pool:
+            self.first = await pool.acquire_context()
+            waiter = asyncio.create_task(pool.acquire_context())
+            await asyncio.sleep(0)
+            self.waiter_was_blocked = not waiter.done()
+            self.first.fail_close = fail_close
+            await pool.release_context(self.first)
+            self.second = await asyncio.wait_for(waiter, timeout=1)
+
+    def then_waiter_gets_fresh_context(self):
+        assert self.waiter_was_blocked
+        assert self.second is not self.first
+        assert not self.second.closed
+
+    @pytest.mark.asyncio
+    async def test_released_context_is_closed_and_frees_slot(self, monkeypatch):
+        """Releasing closes the context and lets a waiting borrower in."""
+        self.given_fake_browser(monkeypatch)
+        await self.when_context_is_released_while_another_waits()
+        assert self.first.closed
+        self.then_waiter_gets_fresh_context()
+
+    @pytest.mark.asyncio
+    async def test_context_that_fails_to_close_frees_slot(self, monkeypatch):
+        """A context that can't be closed still lets a waiting borrower in."""
+        self.given_fake_browser(monkeypatch)
+        await self.when_context_is_released_while_another_waits(fail_close=True)
+        self.then_waiter_gets_fresh_context()
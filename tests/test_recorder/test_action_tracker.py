@@ -67,6 +67,25 @@ class TestActionTracker:
             assert action["value"] == "test@example.com"
             assert "#email" in action["selector"]
 
+    @pytest.mark.asyncio
+    async def test_notifies_on_action(self, simple_form_url):
+        """Invokes the on_action callback when an action is recorded."""
+        # Given: A page with a form is loaded
+        async with PageLoader() as loader:
+            page = await loader.load(simple_form_url)
+
+            # Given: An action tracker is started with a callback
+            notifications = []
+            tracker = ActionTracker(page, on_action=lambda: notifications.append(1))
+            await tracker.start()
+
+            # When: A button is clicked
+            await page.click('button[type="submit"]', no_wait_after=True)
+            await page.wait_for_timeout(100)
+
+            # Then: The callback was invoked
+            assert notifications
+
     @pytest.mark.asyncio
     async def test_tracks_multiple_actions_in_order(self, simple_form_url):
         """Tracks multiple actions in the order they occurred."""
@@ -119,6 +138,26 @@ class TestActionTracker:
             assert action["type"] == "fill"
             assert action["value"] == "test@example.com"
 
+    @pytest.mark.asyncio
+    async def test_debounces_keystrokes(self, simple_form_url):
+        """Typing key by key leaves one fill action with the final value."""
+        # Given: A page with a form is loaded
+        async with PageLoader() as loader:
+            page = await loader.load(simple_form_url)
+
+            # Given: An action tracker is started
+            tracker = ActionTracker(page)
+            await tracker.start()
+
+            # When: Text is typed one key at a time
+            await page.type("#email", "abc")
+
+            # Then: A single fill action holds the full value
+            actions = await tracker.get_actions()
+            fills = [action for action in actions if action["type"] == "fill"]
+            assert len(fills) == 1, "Expected one fill action (debounced)"
+            assert fills[0]["value"] == "abc"
+
     @pytest.mark.asyncio
     async def test_clear_actions(self, simple_form_url):
         """Clear actions removes all tracked actions."""
@@ -138,6 +177,25 @@ class TestActionTracker:
             actions = await tracker.get_actions()
             assert len(actions) == 0, "Expected no actions after clear"
 
+    @pytest.mark.asyncio
+    async def test_drain_returns_and_clears_actions(self, simple_form_url):
+        """get_actions(drain=True) returns the actions and clears them."""
+        # Given: A page with a form is loaded
+        async with PageLoader() as loader:
+            page = await loader.load(simple_form_url)
+
+            # Given: An action tracker has recorded an action
+            tracker = ActionTracker(page)
+            await tracker.start()
+            await page.fill("#email", "test@example.com")
+
+            # When: Actions are drained
+            drained = await tracker.get_actions(drain=True)
+
+            # Then: The action is returned once, and nothing is left
+            assert [action["type"] for action in drained] == ["fill"]
+            assert await tracker.get_actions() == []
+
     @pytest.mark.asyncio
     async def test_selector_stability_marked(self, simple_form_url):
         """Actions include is_fragile flag for selector stability."""
@@ -158,3 +216,166 @@ class TestActionTracker:
             assert "is_fragile" in actions[0]
             # ID selectors should not be fragile
             assert actions[0]["is_fragile"] is False
+
+    @pytest.mark.asyncio
+    async def test_keeps_fills_of_same_class_inputs_read_separately(
+        self, simple_form_url
+    ):
+        """Fills of two inputs sharing a selector survive separate reads."""
+        # Given: A page with two inputs that differ only by name
+        async with PageLoader() as loader:
+            page = await loader.load(simple_form_url)
+            await page.set_content(
+                '<input name="first" class="form-control">'
+                '<input name="last" class="form-control">'
+            )
+            tracker = ActionTracker(page)
+            await tracker.start()
+
+            # When: Each input is filled and actions are read in between
+            await page.fill('[name="first"]', "Ada")
+            await tracker.get_actions()
+            await page.fill('[name="last"]', "Lovelace")
+            actions = await tracker.get_actions()
+
+            # Then: Both fills are kept
+            assert [a["value"] for a in actions] == ["Ada", "Lovelace"]
+
+    @pytest.mark.asyncio
+    async def test_ignores_actions_inside_iframes(self, simple_form_url):
+        """Input inside an iframe is not recorded for the top document."""
+        # Given: A tracked page that then gains an iframe with an input
+        async with PageLoader() as loader:
+            page = await loader.load(simple_form_url)
+            tracker = ActionTracker(page)
+            await tracker.start()
+            await page.evaluate(
+                """() => new Promise((resolve) => {
+                    const frame = document.createElement('iframe');
+                    frame.srcdoc = '<input id="inner">';
+                    frame.addEventListener('load', () => resolve());
+                    document.body.append(frame);
+                })"""
+            )
+
+            # When: The input inside the iframe is filled
+            await page.frame_locator("iframe").locator("#inner").fill("hidden")
+            await page.wait_for_timeout(100)
+
+            # Then: No action is tracked
+            assert await tracker.get_actions() == []
+
+
+class FakeTrackedPage:
+    """Stands in for a page, handing out queued batches of raw actions."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+
+    async def evaluate(self, expression, *args):
+        return self.batches.pop(0) if self.batches else []
+
+
+def raw_action(
+    action_type, element_id, value=None, input_click=False, element_key=None
+):
+    """Build a raw action as the injected script reports it."""
+    return {
+        "type": action_type,
+        "value": value,
+        "inputClick": input_click,
+        "elementKey": element_key or element_id,
+        "elementInfo": {"tag": "input", "id": element_id, "classes": ""},
+    }
+
+
+def raw_class_action(action_type, element_key, value=None, input_click=False):
+    """Build a raw action on an input known only by its class."""
+    return {
+        "type": action_type,
+        "value": value,
+        "inputClick": input_click,
+        "elementKey": element_key,
+        "elementInfo": {"tag": "input", "id": "", "classes": "form-control"},
+    }
+
+
+class TestActionTrackerAcrossReads:
+    """Test debouncing of actions that arrive in separate reads."""
+
+    @pytest.mark.asyncio
+    async def test_continued_typing_updates_fill_in_place(self):
+        """A fill read after an earlier fill of the same input replaces it."""
+        # Given: Typing into one field spans two reads
+        page = FakeTrackedPage(
+            [raw_action("click", "email", input_click=True)],
+            [raw_action("fill", "email", "te")],
+            [raw_action("fill", "email", "test")],
+        )
+        tracker = ActionTracker(page)
+
+        # When: Actions are read after each batch
+        for _ in range(3):
+            actions = await tracker.get_actions()
+
+        # Then: One fill with the final value remains
+        assert actions == [
+            {"type": "fill", "selector": "#email", "is_fragile": False, "value": "test"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_refill_after_other_action_moves_to_end(self):
+        """Refilling an input after another action moves its fill last."""
+        # Given: A field is filled, a button clicked, then the field refilled
+        page = FakeTrackedPage(
+            [raw_action("fill", "email", "a"), raw_action("click", "submit")],
+            [raw_action("fill", "email", "b")],
+        )
+        tracker = ActionTracker(page)
+
+        # When: Actions are read after each batch
+        await tracker.get_actions()
+        actions = await tracker.get_actions()
+
+        # Then: The click comes first, followed by the latest fill
+        assert [(a["selector"], a.get("value")) for a in actions] == [
+            ("#submit", None),
+            ("#email", "b"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fills_of_inputs_sharing_a_selector_are_kept(self):
+        """Fills of two inputs with the same selector both survive."""
+        # Given: Two inputs with the same class are filled in separate reads
+        page = FakeTrackedPage(
+            [raw_class_action("fill", "first", "Ada")],
+            [raw_class_action("fill", "last", "Lovelace")],
+        )
+        tracker = ActionTracker(page)
+
+        # When: Actions are read after each batch
+        await tracker.get_actions()
+        actions = await tracker.get_actions()
+
+        # Then: Both fills are kept, in order
+        assert [(a["selector"], a["value"]) for a in actions] == [
+            ("input.form-control", "Ada"),
+            ("input.form-control", "Lovelace"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fill_keeps_click_on_other_input_sharing_a_selector(self):
+        """A fill only replaces the focusing click on its own input."""
+        # Given: One input is clicked, then another with the same class filled
+        page = FakeTrackedPage(
+            [raw_class_action("click", "first", input_click=True)],
+            [raw_class_action("fill", "last", "Lovelace")],
+        )
+        tracker = ActionTracker(page)
+
+        # When: Actions are read after each batch
+        await tracker.get_actions()
+        actions = await tracker.get_actions()
+
+        # Then: The click on the first input is kept
+        assert [a["type"] for a in actions] == ["click", "fill"]
@@ -5,9 +5,15 @@ from pathlib import Path
 import pytest
 
 from js_interaction_detector.page_loader import PageLoader
-from js_interaction_detector.recorder.change_observer import ChangeObserver
+from js_interaction_detector.recorder.change_observer import (
+    MAX_BUFFERED_MUTATIONS,
+    SETTLE_POLL_MS,
+    SETTLE_QUIET_MS,
+    ChangeObserver,
+)
 from js_interaction_detector.recorder.test_generator import (
     CSSChange,
+    DOMChange,
     NetworkRequest,
 )
 
@@ -26,6 +32,175 @@ def api_call_page_url():
     return f"file://{fixtures_path}/api_call_page.html"
 
 
+def added_mutation(element_id):
+    """Build a childList mutation as the injected script reports it."""
+    return {
+        "type": "childList",
+        "action": "added",
+        "key": f"childList|added|div|{element_id}|||",
+        "elementInfo": {
+            "tag": "div",
+            "id": element_id,
+            "classes": [],
+            "data-testid": "",
+            "aria-label": "",
+        },
+    }
+
+
+class StubPage:
+    """Records what ChangeObserver registers and how long it waits.
+
+    Each wait_for_timeout call first pushes the next queued batch (if any)
+    through the exposed binding, as the page would while settling.
+    """
+
+    def __init__(self, batches_while_settling=()):
+        self.bindings = {}
+        self.init_scripts = []
+        self.listeners = []
+        self.evaluate_calls = 0
+        self.waits = 0
+        self.batches_while_settling = list(batches_while_settling)
+
+    async def expose_function(self, name, callback):
+        self.bindings[name] = callback
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def on(self, event, handler):
+        self.listeners.append(event)
+
+    async def evaluate(self, script, arg=None):
+        self.evaluate_calls += 1
+
+    async def wait_for_timeout(self, timeout):
+        if self.waits < len(self.batches_while_settling):
+            self.push(self.batches_while_settling[self.waits])
+        self.waits += 1
+
+    def push(self, batch):
+        self.bindings["__onMutations__"](batch)
+
+
+class TestChangeObserverWithStubPage:
+    """Test ChangeObserver buffering and settling without a browser."""
+
+    @pytest.mark.asyncio
+    async def test_start_registers_binding_and_init_script_once(self):
+        """Calling start() again only re-injects into the current document."""
+        # Given: An observer on a stub page
+        page = StubPage()
+        observer = ChangeObserver(page)
+
+        # When: start() is called twice
+        await observer.start()
+        await observer.start()
+
+        # Then: Binding, init script and request listener are registered once
+        assert list(page.bindings) == ["__onMutations__"]
+        assert len(page.init_scripts) == 1
+        assert page.listeners == ["request"]
+
+        # Then: The current document gets the script both times
+        assert page.evaluate_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_settle_wait_ends_once_page_is_quiet(self):
+        """after_action stops polling after SETTLE_QUIET_MS without changes."""
+        # Given: A started observer on a page that never mutates
+        page = StubPage()
+        observer = ChangeObserver(page, settle_timeout=500)
+        await observer.start()
+
+        # When: An action completes
+        await observer.before_action()
+        changes = await observer.after_action()
+
+        # Then: Only the quiet period was waited, not the whole settle_timeout
+        assert changes == []
+        assert page.waits == SETTLE_QUIET_MS // SETTLE_POLL_MS
+
+    @pytest.mark.asyncio
+    async def test_settle_wait_restarts_after_new_mutation(self):
+        """A mutation arriving while settling restarts the quiet period."""
+        # Given: A page that mutates during the first poll
+        page = StubPage(batches_while_settling=[[added_mutation("panel")]])
+        observer = ChangeObserver(page, settle_timeout=500)
+        await observer.start()
+
+        # When: An action completes
+        await observer.before_action()
+        changes = await observer.after_action()
+
+        # Then: The mutation is reported after one extra quiet period
+        assert changes == [DOMChange(change_type="added", selector="#panel")]
+        assert page.waits == 1 + SETTLE_QUIET_MS // SETTLE_POLL_MS
+
+    @pytest.mark.asyncio
+    async def test_repeated_mutations_across_batches_are_buffered_once(self):
+        """A mutation key already buffered is dropped from later batches."""
+        # Given: A page that re-sends the same mutation on every poll
+        page = StubPage(batches_while_settling=[[added_mutation("panel")]] * 10)
+        observer = ChangeObserver(page, settle_timeout=500)
+        await observer.start()
+
+        # When: An action completes
+        await observer.before_action()
+        changes = await observer.after_action()
+
+        # Then: Repeats don't grow the buffer, so the page counts as quiet
+        assert changes == [DOMChange(change_type="added", selector="#panel")]
+        assert page.waits == 1 + SETTLE_QUIET_MS // SETTLE_POLL_MS
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_capped(self, caplog):
+        """No more than MAX_BUFFERED_MUTATIONS mutations are kept per action."""
+        # Given: A started observer reporting every change
+        page = StubPage()
+        observer = ChangeObserver(page, max_changes_per_action=10_000)
+        await observer.start()
+        await observer.before_action()
+
+        # When: The page reports more distinct mutations than the cap
+        page.push([added_mutation(f"row-{i}") for i in range(MAX_BUFFERED_MUTATIONS)])
+        page.push([added_mutation(f"extra-{i}") for i in range(30)])
+        page.push([added_mutation(f"late-{i}") for i in range(20)])
+        changes = await observer.after_action()
+
+        # Then: Only the first MAX_BUFFERED_MUTATIONS are reported
+        assert len(changes) == MAX_BUFFERED_MUTATIONS
+        assert changes[-1] == DOMChange(
+            change_type="added", selector=f"#row-{MAX_BUFFERED_MUTATIONS - 1}"
+        )
+
+        # Then: The truncation is counted and warned about once
+        assert observer.dropped_mutations == 50
+        warnings = [r for r in caplog.records if "buffer full" in r.getMessage()]
+        assert len(warnings) == 1
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_emptied_before_next_action(self):
+        """Mutations from one action are not reported again for the next."""
+        # Given: An action whose mutation was collected
+        page = StubPage()
+        observer = ChangeObserver(page)
+        await observer.start()
+        await observer.before_action()
+        page.push([added_mutation("panel")])
+        await observer.after_action()
+
+        # When: The next action reports the same mutation again
+        await observer.before_action()
+        page.push([added_mutation("panel")])
+        changes = await observer.after_action()
+
+        # Then: It is buffered afresh rather than dropped as a repeat
+        assert changes == [DOMChange(change_type="added", selector="#panel")]
+        assert observer.dropped_mutations == 0
+
+
 class TestChangeObserver:
     """Test the ChangeObserver detects DOM changes."""
 
@@ -121,3 +296,61 @@ class TestChangeObserver:
             assert len(httpbin_requests) > 0, (
                 "Expected request to httpbin.org to be detected"
             )
+
+    @pytest.mark.asyncio
+    async def test_filtered_mutations_never_reach_python(self, dropdown_page_url):
+        """Fragile and ignored-tag elements are dropped inside the page."""
+        # Given: A page with a started observer
+        async with PageLoader() as loader:
+            page = await loader.load(dropdown_page_url)
+            observer = ChangeObserver(page)
+            await observer.start()
+
+            # When: A stable, a fragile and an ignored-tag element are added
+            await observer.before_action()
+            await page.evaluate(
+                """() => {
+                    const stable = document.createElement('div');
+                    stable.id = 'stable-panel';
+                    const fragile = document.createElement('div');
+                    fragile.className = 'toast';
+                    const ignored = document.createElement('img');
+                    ignored.id = 'ignored-image';
+                    document.body.append(stable, fragile, ignored);
+                }"""
+            )
+            changes = await observer.after_action()
+
+            # Then: Only the stable element is reported; Python no longer
+            # filters these, so anything else would have reached it
+            assert changes == [DOMChange(change_type="added", selector="#stable-panel")]
+
+    @pytest.mark.asyncio
+    async def test_ignores_mutations_inside_iframes(self, dropdown_page_url):
+        """Changes inside an iframe are not reported for the top document."""
+        # Given: A page with a started observer
+        async with PageLoader() as loader:
+            page = await loader.load(dropdown_page_url)
+            observer = ChangeObserver(page)
+            await observer.start()
+
+            # When: An iframe is added whose document adds a stable element
+            await observer.before_action()
+            await page.evaluate(
+                """() => new Promise((resolve) => {
+                    const frame = document.createElement('iframe');
+                    frame.srcdoc = `<body><script>
+                        addEventListener('load', () => {
+                            const el = document.createElement('div');
+                            el.id = 'inside-frame';
+                            document.body.append(el);
+                        });
+                    <\\/script></body>`;
+                    frame.addEventListener('load', () => resolve());
+                    document.body.append(frame);
+                })"""
+            )
+            changes = await observer.after_action()
+
+            # Then: Nothing is reported (the iframe itself is an ignored tag)
+            assert changes == []
@@ -41,6 +41,20 @@ class TestSelectorGenerator:
     def when_selector_is_generated(self):
         self.selector, self.is_fragile = generate_selector(self.element_info)
 
+    def when_selector_is_generated_twice(self, caplog):
+        with caplog.at_level("INFO"):
+            self.when_selector_is_generated()
+            self.when_selector_is_generated()
+        self.log_messages = [record.getMessage() for record in caplog.records]
+
+    def then_fragility_warning_is_logged_each_time(self):
+        warnings = [m for m in self.log_messages if "tag-only selector" in m]
+        assert len(warnings) == 2
+
+    def then_selector_is_logged_each_time(self):
+        logged = [m for m in self.log_messages if "Generated selector from id" in m]
+        assert len(logged) == 2
+
     def then_selector_is(self, expected):
         assert self.selector == expected
 
@@ -124,3 +138,15 @@ class TestSelectorGenerator:
         self.when_selector_is_generated()
         self.then_selector_is("div.valid.another")
         self.then_selector_is_fragile()
+
+    def test_warns_about_tag_only_selector_every_time(self, caplog):
+        """The fragile tag-only warning is logged for every element, not once."""
+        self.given_element_with_nothing()
+        self.when_selector_is_generated_twice(caplog)
+        self.then_fragility_warning_is_logged_each_time()
+
+    def test_logs_every_generated_selector(self, caplog):
+        """Selectors served from the cache are still logged."""
+        self.given_element_with_id_only()
+        self.when_selector_is_generated_twice(caplog)
+        self.then_selector_is_logged_each_time()
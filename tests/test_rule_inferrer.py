@@ -10,6 +10,10 @@ class TestRuleInferrer:
     def when_rule_is_inferred(self):
         self.rule = infer_validation_rule(self.code)
 
+    def when_rule_is_inferred_twice(self):
+        self.rule = infer_validation_rule(self.code)
+        self.second_rule = infer_validation_rule(self.code)
+
     def then_rule_type_is(self, expected_type):
         assert self.rule.type == expected_type
 
@@ -22,6 +26,17 @@ class TestRuleInferrer:
     def then_confidence_is_none(self):
         assert self.rule.confidence is None
 
+    def when_rule_is_inferred_twice_capturing_logs(self, caplog):
+        with caplog.at_level("INFO"):
+            self.when_rule_is_inferred_twice()
+        self.log_messages = [record.getMessage() for record in caplog.records]
+
+    def then_log_appears_each_time(self, text):
+        assert sum(text in message for message in self.log_messages) == 2
+
+    def then_both_results_are_the_same_object(self):
+        assert self.second_rule is self.rule
+
     def then_description_contains(self, text):
         assert (
             text in self.rule.description
@@ -120,3 +135,17 @@ class TestRuleInferrer:
         """)
         self.when_rule_is_inferred()
         self.then_rule_type_is("email")
+
+    def test_identical_code_reuses_inferred_rule(self):
+        """Inferring the same handler code twice returns the cached rule."""
+        self.given_code("if (!value) { showError('Required'); }")
+        self.when_rule_is_inferred_twice()
+        self.then_rule_type_is("required")
+        self.then_both_results_are_the_same_object()
+
+    def test_logs_each_inference_of_cached_code(self, caplog):
+        """Cached results are still logged every time they are returned."""
+        self.given_code("const unrelated = compute();")
+        self.when_rule_is_inferred_twice_capturing_logs(caplog)
+        self.then_rule_type_is("unknown")
+        self.then_log_appears_each_time("No pattern matched")